@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import json
 import io
+from dataclasses import replace
 from decimal import Decimal
 from financial_core import FinancialModel, round_decimal
 from investment_module import InvestmentModule
@@ -78,20 +79,26 @@ def render_project_basic_info(model):
         col1, col2 = st.columns(2)
         
         with col1:
-            model.basic_info.project_name = st.text_input(
+            project_name = st.text_input(
                 "项目名称",
                 value=model.basic_info.project_name,
                 key="project_name_input"
             )
         
         with col2:
-            model.basic_info.prior_work_years = st.number_input(
+            prior_work_years = st.number_input(
                 "前期工作年限（年）",
                 min_value=1,
                 max_value=30,
                 value=model.basic_info.prior_work_years,
                 key="prior_work_years_input"
             )
+        
+        model.basic_info = replace(
+            model.basic_info,
+            project_name=project_name,
+            prior_work_years=prior_work_years
+        )
 
 
 def render_investment_inputs(model):
@@ -426,7 +433,7 @@ def render_tax_parameters(model):
                 key="income_tax_rate_input"
             )))
             
-            model.parameters.surplus_reserve_rate = Decimal(str(st.number_input(
+            surplus_reserve_rate = Decimal(str(st.number_input(
                 "盈余公积金比率",
                 value=float(model.parameters.surplus_reserve_rate),
                 format="%.2f",
@@ -438,7 +445,7 @@ def render_tax_parameters(model):
         col1, col2 = st.columns(2)
         
         with col1:
-            model.parameters.discount_rate = Decimal(str(st.number_input(
+            discount_rate = Decimal(str(st.number_input(
                 "折现率（内部收益率ic）",
                 value=float(model.parameters.discount_rate),
                 format="%.2f",
@@ -447,13 +454,20 @@ def render_tax_parameters(model):
             )))
         
         with col2:
-            model.parameters.loss_offset_years = st.number_input(
+            loss_offset_years = st.number_input(
                 "亏损弥补年限（年）",
                 min_value=1,
                 max_value=10,
                 value=model.parameters.loss_offset_years,
                 key="loss_offset_years_input"
             )
+        
+        model.parameters = replace(
+            model.parameters,
+            surplus_reserve_rate=surplus_reserve_rate,
+            discount_rate=discount_rate,
+            loss_offset_years=loss_offset_years
+        )
 
 
 def render_asset_parameters(model):
@@ -60,11 +60,11 @@ def check_python_version():
     print()
     
     # 检查Python版本是否符合要求
-    if sys.version_info >= (3, 8):
-        print("[OK] Python version 3.8+ is satisfied")
+    if sys.version_info >= (3, 10):
+        print("[OK] Python version 3.10+ is satisfied")
         return True
     else:
-        print("[FAIL] Python version 3.8+ is required")
+        print("[FAIL] Python version 3.10+ is required")
         return False
 
 
@@ -153,7 +153,7 @@ def main():
         print("System needs fixes before running!")
         print()
         if not python_ok:
-            print("- Please install Python 3.8 or higher")
+            print("- Please install Python 3.10 or higher")
         if not deps_ok:
             print("- Please install dependencies: pip install -r requirements.txt")
         if not imports_ok:
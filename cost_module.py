@@ -4,6 +4,12 @@ from financial_core import FinancialModel, round_decimal, ProjectPeriod
 from financial_calculator import FinancialCalculatorBase
 
 
+_ZERO = Decimal('0')
+# 含税金额中的进项税比例：税率/(1+税率)，导入时计算一次
+_VAT13_FACTOR = Decimal('0.13') / Decimal('1.13')
+_VAT9_FACTOR = Decimal('0.09') / Decimal('1.09')
+
+
 class MaterialCostCalculator(FinancialCalculatorBase):
     """外购原材料费用计算器 - 对应工作表5-1"""
     
@@ -23,7 +29,7 @@ class MaterialCostCalculator(FinancialCalculatorBase):
                     
                     # 计算进项税（假设税率13%）
                     vat_input = round_decimal(
-                        material_cost * Decimal('0.13') / Decimal('1.13')
+                        material_cost * _VAT13_FACTOR
                     )
                     
                     # 更新结果（这里简化处理，不单独存储材料成本）
@@ -57,7 +63,7 @@ class FuelPowerCostCalculator(FinancialCalculatorBase):
                     
                     # 计算进项税（假设税率9%）
                     vat_input = round_decimal(
-                        fuel_power_cost * Decimal('0.09') / Decimal('1.09')
+                        fuel_power_cost * _VAT9_FACTOR
                     )
                     
                     # 更新结果
@@ -226,23 +232,31 @@ class TotalCostCalculator(FinancialCalculatorBase):
             cost_data = self.model.cost
             results = self.model.results
             
+            # 循环内用到的字典和方法先绑定为局部变量
+            material = cost_data.material_cost
+            fuel_power = cost_data.fuel_power_cost
+            labor = cost_data.labor_cost
+            repair = cost_data.repair_cost
+            other = cost_data.other_cost
+            is_operation_year = self.period.is_operation_year
+            
             for year_idx in range(self.period.total_period):
                 year = year_idx + 1
                 
-                if self.period.is_operation_year(year):
+                if is_operation_year(year):
                     # 计算总成本
                     total_cost = round_decimal(
-                        cost_data.material_cost.get(year, Decimal('0')) +
-                        cost_data.fuel_power_cost.get(year, Decimal('0')) +
-                        cost_data.labor_cost.get(year, Decimal('0')) +
-                        cost_data.repair_cost.get(year, Decimal('0')) +
-                        cost_data.other_cost.get(year, Decimal('0'))
+                        material.get(year, _ZERO) +
+                        fuel_power.get(year, _ZERO) +
+                        labor.get(year, _ZERO) +
+                        repair.get(year, _ZERO) +
+                        other.get(year, _ZERO)
                     )
                     
                     results.annual_cost[year_idx] = total_cost
                 else:
                     # 建设期无成本
-                    results.annual_cost[year_idx] = Decimal('0')
+                    results.annual_cost[year_idx] = _ZERO
             
             return True
             
@@ -56,121 +56,102 @@ def calculate_financial_model():
     # 初始化各年数据数组
     revenue = [0.0] * total_period  # 营业收入
     operating_cost = [0.0] * total_period  # 经营成本
-    VAT_output = [0.0] * total_period  # 销项税
     VAT_input = [0.0] * total_period  # 进项税
-    VAT_paid = [0.0] * total_period  # 实缴增值税
     VAT_refund = [0.0] * total_period  # 增值税退税
     business_tax = [0.0] * total_period  # 营业税
-    city_maintenance_tax = [0.0] * total_period  # 城市维护建设税
-    education_surcharge = [0.0] * total_period  # 教育费附加
-    local_education_surcharge = [0.0] * total_period  # 地方教育费附加
     land_value_tax = [0.0] * total_period  # 土地增值税
-    income_tax = [0.0] * total_period  # 所得税
-    profit_before_tax = [0.0] * total_period  # 税前利润
     profit_after_tax = [0.0] * total_period  # 税后利润
     depreciation = [0.0] * total_period  # 折旧
     amortization = [0.0] * total_period  # 摊销
     interest_payment = [0.0] * total_period  # 利息支付
     principal_repayment = [0.0] * total_period  # 本金偿还
     loan_balance = [0.0] * total_period  # 贷款余额
-    fixed_asset_investment = [0.0] * total_period  # 固定资产投资
     working_capital_investment = [0.0] * total_period  # 流动资金投资
-    cash_flow_in = [0.0] * total_period  # 现金流入
-    cash_flow_out = [0.0] * total_period  # 现金流出
-    net_cash_flow = [0.0] * total_period  # 净现金流量
-    cumulative_cash_flow = [0.0] * total_period  # 累计净现金流量
     
-    # 读取用户输入的每年收入数据
+    # 读取用户输入的每年收入、成本数据
+    session_get = st.session_state.get
     for i in range(construction_period, total_period):
-        key = f"income_year_{i+1}"
-        revenue[i] = st.session_state.get(key, 0.0)
-    
-    # 读取用户输入的每年成本数据
-    for i in range(construction_period, total_period):
-        key = f"cost_year_{i+1}"
-        operating_cost[i] = st.session_state.get(key, revenue[i] * 0.1)  # 默认成本为收入的10%
+        revenue[i] = session_get(f"income_year_{i+1}", 0.0)
+        operating_cost[i] = session_get(f"cost_year_{i+1}", revenue[i] * 0.1)  # 默认成本为收入的10%
     
     # 计算每年的折旧
     annual_depreciation = fixed_assets_with_interest * (1 - salvage_rate_house) / depreciation_years_house
     for i in range(construction_period, total_period):
         depreciation[i] = annual_depreciation
     
-    # 计算每年的现金流
-    for i in range(total_period):
-        year_idx = i
-        
-        if year_idx < construction_period:
-            # 建设期投资
-            if year_idx == 0:
-                fixed_asset_investment[year_idx] = project_investment_total * 0.4
-            elif year_idx == 1:
-                fixed_asset_investment[year_idx] = project_investment_total * 0.3
-            else:
-                fixed_asset_investment[year_idx] = project_investment_total * 0.3
-                
-            cash_flow_out[year_idx] = fixed_asset_investment[year_idx]
-            net_cash_flow[year_idx] = -cash_flow_out[year_idx]
-        else:
-            # 运营期
-            cash_flow_in[year_idx] = revenue[year_idx]
-            
-            # 计算税费
-            VAT_output[year_idx] = revenue[year_idx] * 0.09 / 1.09  # 9%销项税
-            VAT_paid[year_idx] = max(0, VAT_output[year_idx] - VAT_input[year_idx])  # 实际缴纳的增值税
-            city_maintenance_tax[year_idx] = VAT_paid[year_idx] * 0.07  # 城建税 7%
-            education_surcharge[year_idx] = VAT_paid[year_idx] * 0.03  # 教育费附加 3%
-            local_education_surcharge[year_idx] = VAT_paid[year_idx] * 0.02  # 地方教育费附加 2%
-            
-            # 税前利润
-            profit_before_tax[year_idx] = revenue[year_idx] - operating_cost[year_idx] - depreciation[year_idx] - \
-                                        city_maintenance_tax[year_idx] - education_surcharge[year_idx] - \
-                                        local_education_surcharge[year_idx] - land_value_tax[year_idx]
-            
-            # 所得税（亏损不交税）
-            income_tax[year_idx] = max(0, profit_before_tax[year_idx] * 0.25)
-            
-            # 现金流出
-            cash_flow_out[year_idx] = operating_cost[year_idx] + city_maintenance_tax[year_idx] + \
-                                     education_surcharge[year_idx] + local_education_surcharge[year_idx] + \
-                                     income_tax[year_idx] + land_value_tax[year_idx]
-            
-            # 净现金流量
-            net_cash_flow[year_idx] = cash_flow_in[year_idx] - cash_flow_out[year_idx]
+    # 计算每年的现金流（按年份数组整体计算）
+    operating = np.arange(total_period) >= construction_period
+    revenue = np.asarray(revenue)
+    operating_cost = np.asarray(operating_cost)
+    depreciation = np.asarray(depreciation)
+    
+    # 建设期投资：第1年40%，以后各年30%
+    fixed_asset_investment = np.zeros(total_period)
+    fixed_asset_investment[:construction_period] = project_investment_total * 0.3
+    fixed_asset_investment[:min(construction_period, 1)] = project_investment_total * 0.4
+    
+    # 运营期现金流入
+    cash_flow_in = np.where(operating, revenue, 0.0)
+    
+    # 计算税费
+    VAT_output = np.where(operating, revenue * 0.09 / 1.09, 0.0)  # 9%销项税
+    VAT_paid = np.maximum(VAT_output - np.asarray(VAT_input), 0.0)  # 实际缴纳的增值税
+    city_maintenance_tax = VAT_paid * 0.07  # 城建税 7%
+    education_surcharge = VAT_paid * 0.03  # 教育费附加 3%
+    local_education_surcharge = VAT_paid * 0.02  # 地方教育费附加 2%
+    
+    # 税前利润
+    profit_before_tax = np.where(
+        operating,
+        revenue - operating_cost - depreciation - city_maintenance_tax - education_surcharge - \
+        local_education_surcharge - np.asarray(land_value_tax),
+        0.0
+    )
+    
+    # 所得税（亏损不交税）
+    income_tax = np.maximum(profit_before_tax * 0.25, 0.0)
+    
+    # 现金流出：建设期为投资，运营期为经营成本及税费
+    cash_flow_out = np.where(
+        operating,
+        operating_cost + city_maintenance_tax + education_surcharge + local_education_surcharge + \
+        income_tax + np.asarray(land_value_tax),
+        fixed_asset_investment
+    )
+    
+    # 净现金流量
+    net_cash_flow = cash_flow_in - cash_flow_out
     
     # 计算累计净现金流量
-    for i in range(total_period):
-        if i == 0:
-            cumulative_cash_flow[i] = net_cash_flow[i]
-        else:
-            cumulative_cash_flow[i] = cumulative_cash_flow[i-1] + net_cash_flow[i]
+    cumulative_cash_flow = np.cumsum(net_cash_flow).tolist()
     
     # 计算NPV
     discount_rate = st.session_state.get('discount_rate', 0.06)
-    npv = sum([net_cash_flow[i] / ((1 + discount_rate) ** i) for i in range(total_period)])
+    npv = float(sum([net_cash_flow[i] / ((1 + discount_rate) ** i) for i in range(total_period)]))
     
     # 计算静态投资回收期
     payback_period = None
     for i in range(1, total_period):
         if cumulative_cash_flow[i] >= 0 and cumulative_cash_flow[i-1] < 0:
-            payback_period = i + (abs(cumulative_cash_flow[i-1]) / net_cash_flow[i])
+            payback_period = i + (abs(cumulative_cash_flow[i-1]) / float(net_cash_flow[i]))
             break
     
     return {
         'years': years,
-        'revenue': revenue,
-        'operating_cost': operating_cost,
-        'depreciation': depreciation,
-        'net_cash_flow': net_cash_flow,
+        'revenue': revenue.tolist(),
+        'operating_cost': operating_cost.tolist(),
+        'depreciation': depreciation.tolist(),
+        'net_cash_flow': net_cash_flow.tolist(),
         'cumulative_cash_flow': cumulative_cash_flow,
         'construction_period': construction_period,
         'operation_period': operation_period,
         'total_period': total_period,
         'npv': npv,
         'payback_period': payback_period,
-        'income_tax': income_tax,
-        'city_maintenance_tax': city_maintenance_tax,
-        'education_surcharge': education_surcharge,
-        'local_education_surcharge': local_education_surcharge
+        'income_tax': income_tax.tolist(),
+        'city_maintenance_tax': city_maintenance_tax.tolist(),
+        'education_surcharge': education_surcharge.tolist(),
+        'local_education_surcharge': local_education_surcharge.tolist()
     }
 
 def render_input_form():
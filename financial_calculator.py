@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections import deque
 from typing import Dict, Optional
 from decimal import Decimal
 import numpy as np
@@ -8,13 +9,33 @@ from financial_core import (
     TaxData, CalculationResults
 )
 
+# 常用Decimal常量，避免在循环中重复解析字符串
+_D_ZERO = Decimal('0')
+_D04 = Decimal('0.4')
+_D03 = Decimal('0.3')
+# 含税金额中9%增值税的比例：0.09/1.09
+_VAT9_FACTOR = Decimal('0.09') / Decimal('1.09')
+
 
 class FinancialCalculatorBase(ABC):
     """财务计算基类"""
     
+    # 固定属性槽位，避免逐实例__dict__查找
+    __slots__ = ('model',)
+    
     def __init__(self, model: FinancialModel):
         self.model = model
-        self.period = model.period
+    
+    @property
+    def period(self) -> ProjectPeriod:
+        """项目期间（不可变对象，update_period后随模型替换）"""
+        return self.model.period
+    
+    @property
+    def op_mask(self) -> np.ndarray:
+        """各年是否为运营期的布尔数组（下标0对应第1年），缓存在不可变的期间对象上，
+        同一期间的各计算器、敏感性分析的各情景共用同一个数组"""
+        return self.model.period.operation_mask
     
     @abstractmethod
     def calculate(self) -> bool:
@@ -73,7 +94,7 @@ class InvestmentCalculator(FinancialCalculatorBase):
                  inv.equipment_procurement_cost +
                  inv.equipment_installation_cost +
                  inv.public_equipment_procurement_cost +
-                 inv.public_equipment_installation_cost) * Decimal('0.09') / Decimal('1.09')
+                 inv.public_equipment_installation_cost) * _VAT9_FACTOR
             )
             
             # 计算总投资
@@ -91,9 +112,9 @@ class InvestmentCalculator(FinancialCalculatorBase):
             
             # 按建设期分配：40%, 30%, 30%
             if construction_period >= 3:
-                results.fixed_assets_investment[0] = round_decimal(total_fixed_assets * Decimal('0.4'))
-                results.fixed_assets_investment[1] = round_decimal(total_fixed_assets * Decimal('0.3'))
-                results.fixed_assets_investment[2] = round_decimal(total_fixed_assets * Decimal('0.3'))
+                results.fixed_assets_investment[0] = round_decimal(total_fixed_assets * _D04)
+                results.fixed_assets_investment[1] = round_decimal(total_fixed_assets * _D03)
+                results.fixed_assets_investment[2] = round_decimal(total_fixed_assets * _D03)
             else:
                 # 如果建设期少于3年，平均分配
                 investment_per_year = round_decimal(total_fixed_assets / Decimal(construction_period))
@@ -128,7 +149,7 @@ class DepreciationCalculator(FinancialCalculatorBase):
                     Decimal(assets.depreciation_years)
                 )
             else:
-                annual_depreciation = Decimal('0')
+                annual_depreciation = _D_ZERO
             
             # 计算年摊销额
             if assets.amortization_years > 0:
@@ -136,7 +157,7 @@ class DepreciationCalculator(FinancialCalculatorBase):
                     assets.intangible_assets / Decimal(assets.amortization_years)
                 )
             else:
-                annual_amortization = Decimal('0')
+                annual_amortization = _D_ZERO
             
             # 计算其他资产年摊销额
             if assets.other_assets_years > 0:
@@ -144,7 +165,7 @@ class DepreciationCalculator(FinancialCalculatorBase):
                     assets.other_assets / Decimal(assets.other_assets_years)
                 )
             else:
-                annual_other_amortization = Decimal('0')
+                annual_other_amortization = _D_ZERO
             
             # 填充各年折旧摊销数据
             for year_idx in range(self.period.total_period):
@@ -156,8 +177,8 @@ class DepreciationCalculator(FinancialCalculatorBase):
                     results.annual_amortization[year_idx] = round_decimal(annual_amortization + annual_other_amortization)
                 else:
                     # 建设期无折旧摊销
-                    results.annual_depreciation[year_idx] = Decimal('0')
-                    results.annual_amortization[year_idx] = Decimal('0')
+                    results.annual_depreciation[year_idx] = _D_ZERO
+                    results.annual_amortization[year_idx] = _D_ZERO
             
             return True
             
@@ -176,6 +197,10 @@ class RevenueCalculator(FinancialCalculatorBase):
             tax_data = self.model.tax
             results = self.model.results
             
+            # 税率在各年间不变，循环外只取一次
+            vat_output_rate = tax_data.vat_output_rate
+            vat_output_factor = vat_output_rate / (Decimal('1') + vat_output_rate)
+            
             for year_idx in range(self.period.total_period):
                 year = year_idx + 1
                 
@@ -185,18 +210,18 @@ class RevenueCalculator(FinancialCalculatorBase):
                     results.annual_revenue[year_idx] = total_revenue
                     
                     # 计算销项税（简化：假设总收入都适用9%税率）
-                    if tax_data.vat_output_rate > 0:
+                    if vat_output_rate > 0:
                         vat_output = round_decimal(
-                            total_revenue * tax_data.vat_output_rate / (Decimal('1') + tax_data.vat_output_rate)
+                            total_revenue * vat_output_factor
                         )
                     else:
-                        vat_output = Decimal('0')
+                        vat_output = _D_ZERO
                     
                     results.annual_vat_output[year_idx] = vat_output
                 else:
                     # 建设期无收入
-                    results.annual_revenue[year_idx] = Decimal('0')
-                    results.annual_vat_output[year_idx] = Decimal('0')
+                    results.annual_revenue[year_idx] = _D_ZERO
+                    results.annual_vat_output[year_idx] = _D_ZERO
             
             return True
             
@@ -216,6 +241,11 @@ class CostCalculator(FinancialCalculatorBase):
             assets = self.model.assets
             results = self.model.results
             
+            # 修理费（固定资产原值的0.5%）和进项税率在各年间不变
+            repair_fee = round_decimal(assets.fixed_assets_with_interest * Decimal('0.005'))
+            vat_input_rate = tax_data.vat_input_rate
+            vat_input_divisor = Decimal('1') + vat_input_rate
+            
             for year_idx in range(self.period.total_period):
                 year = year_idx + 1
                 
@@ -223,25 +253,24 @@ class CostCalculator(FinancialCalculatorBase):
                     # 计算总成本
                     total_cost = cost_data.get_total_cost(year)
                     
-                    # 添加修理费（固定资产原值的0.5%）
-                    repair_fee = round_decimal(assets.fixed_assets_with_interest * Decimal('0.005'))
+                    # 添加修理费
                     total_cost = round_decimal(total_cost + repair_fee)
                     
                     results.annual_cost[year_idx] = total_cost
                     
                     # 计算进项税（简化：假设成本都适用13%税率）
-                    if tax_data.vat_input_rate > 0:
+                    if vat_input_rate > 0:
                         vat_input = round_decimal(
-                            total_cost * tax_data.vat_input_rate / (Decimal('1') + tax_data.vat_input_rate)
+                            total_cost * vat_input_rate / vat_input_divisor
                         )
                     else:
-                        vat_input = Decimal('0')
+                        vat_input = _D_ZERO
                     
                     results.annual_vat_input[year_idx] = vat_input
                 else:
                     # 建设期无成本
-                    results.annual_cost[year_idx] = Decimal('0')
-                    results.annual_vat_input[year_idx] = Decimal('0')
+                    results.annual_cost[year_idx] = _D_ZERO
+                    results.annual_vat_input[year_idx] = _D_ZERO
             
             return True
             
@@ -258,23 +287,23 @@ class TaxCalculator(FinancialCalculatorBase):
         try:
             tax_data = self.model.tax
             results = self.model.results
+            city_maintenance_tax_rate = tax_data.city_maintenance_tax_rate
+            education_surtax_rate = tax_data.education_surtax_rate
             
             for year_idx in range(self.period.total_period):
-                year = year_idx + 1
-                
                 # 计算实缴增值税
                 vat_output = results.annual_vat_output[year_idx]
                 vat_input = results.annual_vat_input[year_idx]
-                vat_paid = round_decimal(max(vat_output - vat_input, Decimal('0')))
+                vat_paid = round_decimal(max(vat_output - vat_input, _D_ZERO))
                 
                 results.annual_vat_paid[year_idx] = vat_paid
                 
                 # 计算城市维护建设税
-                city_maintenance_tax = round_decimal(vat_paid * tax_data.city_maintenance_tax_rate)
+                city_maintenance_tax = round_decimal(vat_paid * city_maintenance_tax_rate)
                 results.annual_city_maintenance_tax[year_idx] = city_maintenance_tax
                 
                 # 计算教育费附加
-                education_surtax = round_decimal(vat_paid * tax_data.education_surtax_rate)
+                education_surtax = round_decimal(vat_paid * education_surtax_rate)
                 results.annual_education_surtax[year_idx] = education_surtax
             
             return True
@@ -294,16 +323,16 @@ class ProfitCalculator(FinancialCalculatorBase):
             parameters = self.model.parameters
             results = self.model.results
             
-            cumulative_loss = Decimal('0')  # 累计亏损（用于亏损弥补）
             loss_offset_years = parameters.loss_offset_years
-            loss_history = []  # 亏损历史记录
+            # 亏损历史记录，超过弥补年限的最早一笔亏损在追加时自动移除
+            loss_history = deque(maxlen=max(loss_offset_years, 0))
             
             for year_idx in range(self.period.total_period):
                 year = year_idx + 1
                 
                 if self.period.is_operation_year(year):
                     # 计算税前利润
-                    profit_before_tax = round_decimal(
+                    pbt = results.annual_profit_before_tax[year_idx] = round_decimal(
                         results.annual_revenue[year_idx] -
                         results.annual_cost[year_idx] -
                         results.annual_depreciation[year_idx] -
@@ -312,40 +341,40 @@ class ProfitCalculator(FinancialCalculatorBase):
                         results.annual_education_surtax[year_idx]
                     )
                     
-                    results.annual_profit_before_tax[year_idx] = profit_before_tax
-                    
                     # 亏损弥补逻辑
-                    if profit_before_tax >= 0:
+                    if pbt >= 0:
                         # 有盈利，先弥补以前年度亏损
-                        remaining_loss = Decimal('0')
-                        if loss_history:
-                            # 按时间顺序弥补亏损
-                            for i, loss in enumerate(loss_history):
-                                if remaining_loss <= 0 and i < loss_offset_years:
-                                    remaining_loss = max(loss - profit_before_tax, Decimal('0'))
-                                    profit_before_tax = max(profit_before_tax - loss, Decimal('0'))
-                                    loss_history[i] = remaining_loss
-                            loss_history = [loss for loss in loss_history if loss > 0]
+                        taxable_profit = pbt
+                        remaining_loss = _D_ZERO
+                        # 按时间顺序弥补亏损，直到某笔亏损未能全部弥补
+                        for i in range(len(loss_history)):
+                            if remaining_loss > 0:
+                                break
+                            loss = loss_history[i]
+                            remaining_loss = max(loss - taxable_profit, _D_ZERO)
+                            taxable_profit = max(taxable_profit - loss, _D_ZERO)
+                            loss_history[i] = remaining_loss
                         
-                        # 计算所得税
-                        income_tax = round_decimal(profit_before_tax * tax_data.income_tax_rate)
+                        # 已完全弥补的亏损都在队首
+                        while loss_history and loss_history[0] <= 0:
+                            loss_history.popleft()
+                        
+                        # 计算所得税和税后利润
+                        income_tax = round_decimal(taxable_profit * tax_data.income_tax_rate)
+                        profit_after_tax = round_decimal(taxable_profit - income_tax)
                     else:
                         # 当年亏损，加入亏损历史
-                        loss_history.append(abs(profit_before_tax))
-                        if len(loss_history) > loss_offset_years:
-                            loss_history.pop(0)  # 移除超过弥补期的亏损
-                        income_tax = Decimal('0')
+                        loss_history.append(-pbt)
+                        income_tax = _D_ZERO
+                        profit_after_tax = pbt
                     
                     results.annual_income_tax[year_idx] = income_tax
-                    
-                    # 计算税后利润
-                    profit_after_tax = round_decimal(profit_before_tax - income_tax)
                     results.annual_profit_after_tax[year_idx] = profit_after_tax
                 else:
                     # 建设期无利润
-                    results.annual_profit_before_tax[year_idx] = Decimal('0')
-                    results.annual_income_tax[year_idx] = Decimal('0')
-                    results.annual_profit_after_tax[year_idx] = Decimal('0')
+                    results.annual_profit_before_tax[year_idx] = _D_ZERO
+                    results.annual_income_tax[year_idx] = _D_ZERO
+                    results.annual_profit_after_tax[year_idx] = _D_ZERO
             
             return True
             
@@ -367,7 +396,7 @@ class CashFlowCalculator(FinancialCalculatorBase):
                 
                 if self.period.is_construction_year(year):
                     # 建设期：现金流入=0，现金流出=固定资产投资
-                    cash_flow_in = Decimal('0')
+                    cash_flow_in = _D_ZERO
                     cash_flow_out = results.fixed_assets_investment[year_idx]
                     
                     results.annual_cash_flow_in[year_idx] = cash_flow_in
@@ -383,7 +412,7 @@ class CashFlowCalculator(FinancialCalculatorBase):
                     # 现金流入
                     cash_flow_in = round_decimal(
                         results.annual_revenue[year_idx] +
-                        self.model.revenue.asset_sale_revenue.get(year, Decimal('0'))
+                        self.model.revenue.asset_sale_revenue.get(year, _D_ZERO)
                     )
                     
                     # 现金流出
@@ -403,15 +432,12 @@ class CashFlowCalculator(FinancialCalculatorBase):
                     results.annual_net_cash_flow[year_idx] = net_cash_flow
                 else:
                     # 其他年份
-                    results.annual_cash_flow_in[year_idx] = Decimal('0')
-                    results.annual_cash_flow_out[year_idx] = Decimal('0')
-                    results.annual_net_cash_flow[year_idx] = Decimal('0')
+                    results.annual_cash_flow_in[year_idx] = _D_ZERO
+                    results.annual_cash_flow_out[year_idx] = _D_ZERO
+                    results.annual_net_cash_flow[year_idx] = _D_ZERO
             
             # 计算累计净现金流量
-            cumulative = Decimal('0')
-            for year_idx in range(self.period.total_period):
-                cumulative += results.annual_net_cash_flow[year_idx]
-                results.cumulative_cash_flow[year_idx] = round_decimal(cumulative)
+            results.recompute_cumulative()
             
             return True
             
@@ -432,38 +458,32 @@ class FinancialIndicatorsCalculator(FinancialCalculatorBase):
             
             # 计算净现值(NPV)
             discount_rate = parameters.discount_rate
-            npv = Decimal('0')
-            for year_idx, cash_flow in enumerate(net_cash_flows):
-                if cash_flow != 0:
-                    discount_factor = Decimal('1') / (Decimal('1') + discount_rate) ** year_idx
-                    npv += round_decimal(cash_flow * discount_factor)
-            results.npv = round_decimal(npv)
+            float_cash_flows = results.to_float_array('annual_net_cash_flow')
+            discount_factors = parameters.discount_factors(len(float_cash_flows))
+            results.npv = round_decimal(float(np.dot(float_cash_flows, discount_factors)))
             
             # 计算内部收益率(IRR)
             # 使用numpy的irr函数，转换为float进行计算
             try:
-                float_cash_flows = [float(cf) for cf in net_cash_flows]
                 irr_value = np.irr(float_cash_flows)
                 results.irr = round_decimal(Decimal(str(irr_value)))
             except:
-                results.irr = Decimal('0')
+                results.irr = _D_ZERO
             
             # 计算静态投资回收期
-            cumulative = results.cumulative_cash_flow
+            # 第1年之后首个累计净现金流量非负且当年现金流不为零的年份
+            cumulative = results.to_float_array('cumulative_cash_flow')
+            recovered = (cumulative >= 0) & (float_cash_flows != 0)
+            recovered[:1] = False
             static_payback = None
-            for year_idx, cum_cf in enumerate(cumulative):
-                if cum_cf >= 0 and year_idx > 0:
-                    prev_cum_cf = cumulative[year_idx - 1]
-                    cash_flow = net_cash_flows[year_idx]
-                    if cash_flow != 0:
-                        payback = year_idx + (abs(prev_cum_cf) / abs(cash_flow))
-                        static_payback = float(payback)
-                        break
+            if recovered.any():
+                year_idx = int(np.argmax(recovered))
+                static_payback = year_idx + abs(cumulative[year_idx - 1]) / abs(float_cash_flows[year_idx])
             results.static_payback_period = static_payback
             
             # 计算动态投资回收期
             dynamic_payback = None
-            cumulative_pv = Decimal('0')
+            cumulative_pv = _D_ZERO
             for year_idx, cash_flow in enumerate(net_cash_flows):
                 discount_factor = Decimal('1') / (Decimal('1') + discount_rate) ** year_idx
                 discounted_cf = round_decimal(cash_flow * discount_factor)
@@ -1,33 +1,47 @@
 from decimal import Decimal
 from typing import Dict, List, Optional
+import numpy as np
+import financial_kernels
 from financial_core import FinancialModel, round_decimal, ProjectPeriod
 from financial_calculator import FinancialCalculatorBase
 
 
+_ZERO = Decimal('0')
+# 常用小整数的Decimal，避免重复构造
+_SMALL_INT_DECIMALS = {0: _ZERO, 1: Decimal('1')}
+
+
 def to_decimal(value) -> Decimal:
-    """将各种类型转换为Decimal"""
+    """将各种类型转换为Decimal，Decimal原样返回，常用小整数取缓存"""
     if isinstance(value, Decimal):
         return value
+    if type(value) is int:
+        cached = _SMALL_INT_DECIMALS.get(value)
+        return cached if cached is not None else Decimal(value)
     return Decimal(str(value))
 
 
 class CashFlowStatementCalculator(FinancialCalculatorBase):
     """现金流量表计算器 - 对应工作表8的核心部分"""
     
+    __slots__ = ()
+    
     def calculate(self) -> bool:
         """计算现金流量表"""
         try:
+            period = self.period
             results = self.model.results
             revenue_data = self.model.revenue
             tax_data = self.model.tax
+            total_period = period.total_period
             
-            for year_idx in range(self.period.total_period):
+            for year_idx in range(total_period):
                 year = year_idx + 1
                 
-                if self.period.is_construction_year(year):
+                if period.is_construction_year(year):
                     # 建设期现金流量
                     # 现金流入=0
-                    cash_flow_in = Decimal('0')
+                    cash_flow_in = _ZERO
                     results.annual_cash_flow_in[year_idx] = cash_flow_in
                     
                     # 现金流出=固定资产投资
@@ -35,49 +49,46 @@ class CashFlowStatementCalculator(FinancialCalculatorBase):
                     results.annual_cash_flow_out[year_idx] = cash_flow_out
                     
                     # 净现金流量
-                    net_cash_flow = round_decimal(float(cash_flow_in - cash_flow_out))
+                    net_cash_flow = round_decimal(cash_flow_in - cash_flow_out)
                     results.annual_net_cash_flow[year_idx] = net_cash_flow
                     
-                elif self.period.is_operation_year(year):
+                elif period.is_operation_year(year):
                     # 运营期现金流量
                     # 现金流入=营业收入+固定资产销售收入+回收流动资金+回收固定资产余值
-                    cash_flow_in = round_decimal(float(
+                    cash_flow_in = round_decimal(
                         results.annual_revenue[year_idx] +
-                        to_decimal(revenue_data.asset_sale_revenue.get(year, Decimal('0')))
-                    ))
+                        to_decimal(revenue_data.asset_sale_revenue.get(year, _ZERO))
+                    )
                     results.annual_cash_flow_in[year_idx] = cash_flow_in
                     
                     # 现金流出=经营成本+所得税+附加税费+流动资金投资
                     # 经营成本=总成本-折旧-摊销
-                    operating_cost = round_decimal(float(
+                    operating_cost = round_decimal(
                         results.annual_cost[year_idx] -
                         results.annual_depreciation[year_idx] -
                         results.annual_amortization[year_idx]
-                    ))
+                    )
                     
-                    cash_flow_out = round_decimal(float(
+                    cash_flow_out = round_decimal(
                         operating_cost +
                         results.annual_income_tax[year_idx] +
                         results.annual_city_maintenance_tax[year_idx] +
                         results.annual_education_surtax[year_idx] +
                         results.working_capital_investment[year_idx]
-                    ))
+                    )
                     results.annual_cash_flow_out[year_idx] = cash_flow_out
                     
                     # 净现金流量
-                    net_cash_flow = round_decimal(float(cash_flow_in - cash_flow_out))
+                    net_cash_flow = round_decimal(cash_flow_in - cash_flow_out)
                     results.annual_net_cash_flow[year_idx] = net_cash_flow
                 else:
                     # 其他年份
-                    results.annual_cash_flow_in[year_idx] = Decimal('0')
-                    results.annual_cash_flow_out[year_idx] = Decimal('0')
-                    results.annual_net_cash_flow[year_idx] = Decimal('0')
+                    results.annual_cash_flow_in[year_idx] = _ZERO
+                    results.annual_cash_flow_out[year_idx] = _ZERO
+                    results.annual_net_cash_flow[year_idx] = _ZERO
             
             # 计算累计净现金流量
-            cumulative = Decimal('0')
-            for year_idx in range(self.period.total_period):
-                cumulative += results.annual_net_cash_flow[year_idx]
-                results.cumulative_cash_flow[year_idx] = round_decimal(float(cumulative))
+            results.recompute_cumulative()
             
             return True
             
@@ -89,28 +100,11 @@ class CashFlowStatementCalculator(FinancialCalculatorBase):
 class FinancialIndicatorsCalculator(FinancialCalculatorBase):
     """财务指标计算器"""
     
+    __slots__ = ()
+    
     def calculate_irr(self, cash_flows):
-        """使用二分法计算IRR"""
-        lower_rate = -0.9  # 下限
-        upper_rate = 1.0   # 上限
-        tolerance = 0.0001  # 容差
-        max_iterations = 1000
-        
-        mid_rate = 0.0
-        
-        for _ in range(max_iterations):
-            mid_rate = (lower_rate + upper_rate) / 2
-            npv_mid = sum(cf / ((1 + mid_rate) ** i) for i, cf in enumerate(cash_flows))
-            
-            if abs(npv_mid) < tolerance:
-                return mid_rate
-            
-            if npv_mid > 0:
-                lower_rate = mid_rate
-            else:
-                upper_rate = mid_rate
-        
-        return mid_rate
+        """计算IRR（牛顿迭代，不收敛时退回二分法）"""
+        return financial_kernels.irr(np.asarray(cash_flows, dtype=np.float64))
     
     def calculate(self) -> bool:
         """计算财务指标"""
@@ -121,44 +115,37 @@ class FinancialIndicatorsCalculator(FinancialCalculatorBase):
             
             # 计算净现值(NPV)
             discount_rate = parameters.discount_rate
-            npv = Decimal('0')
-            for year_idx, cash_flow in enumerate(net_cash_flows):
-                if cash_flow != 0:
-                    discount_factor = Decimal('1') / (Decimal('1') + discount_rate) ** year_idx
-                    npv += round_decimal(float(cash_flow * discount_factor))
-            results.npv = round_decimal(float(npv))
+            float_cash_flows = results.to_float_array('annual_net_cash_flow')
+            discount_factors = parameters.discount_factors(len(float_cash_flows))
+            results.npv = round_decimal(float(np.dot(float_cash_flows, discount_factors)))
             
             # 计算内部收益率(IRR)
             try:
-                float_cash_flows = [float(cf) for cf in net_cash_flows]
                 irr_value = self.calculate_irr(float_cash_flows)
-                results.irr = round_decimal(float(irr_value))
+                if np.isnan(irr_value):
+                    results.irr = _ZERO
+                else:
+                    results.irr = round_decimal(float(irr_value))
             except Exception as e:
                 print(f"IRR计算错误: {e}")
-                results.irr = Decimal('0')
+                results.irr = _ZERO
             
             # 计算静态投资回收期
-            cumulative = results.cumulative_cash_flow
-            static_payback = None
-            for year_idx in range(1, len(cumulative)):
-                if cumulative[year_idx] >= 0 and cumulative[year_idx - 1] < 0:
-                    prev_cum_cf = cumulative[year_idx - 1]
-                    cash_flow = net_cash_flows[year_idx]
-                    if cash_flow != 0:
-                        payback = year_idx + (abs(prev_cum_cf) / abs(cash_flow))
-                        static_payback = float(payback)
-                        break
-            results.static_payback_period = static_payback
+            static_payback = financial_kernels.payback(
+                float_cash_flows,
+                results.to_float_array('cumulative_cash_flow')
+            )
+            results.static_payback_period = None if np.isnan(static_payback) else float(static_payback)
             
             # 计算动态投资回收期
             dynamic_payback = None
-            cumulative_pv = Decimal('0')
+            cumulative_pv = _ZERO
             for year_idx, cash_flow in enumerate(net_cash_flows):
                 if cash_flow != 0:
                     discount_factor = Decimal('1') / (Decimal('1') + discount_rate) ** year_idx
-                    discounted_cf = round_decimal(float(cash_flow * discount_factor))
+                    discounted_cf = round_decimal(cash_flow * discount_factor)
                 else:
-                    discounted_cf = Decimal('0')
+                    discounted_cf = _ZERO
                 cumulative_pv += discounted_cf
                 
                 if cumulative_pv >= 0 and year_idx > 0:
@@ -249,8 +236,8 @@ class FinancialComprehensiveModule:
             avg_profit_after_tax = total_profit_after_tax / Decimal(operation_years)
             avg_income_tax = total_income_tax / Decimal(operation_years)
         else:
-            avg_profit_after_tax = Decimal('0')
-            avg_income_tax = Decimal('0')
+            avg_profit_after_tax = _ZERO
+            avg_income_tax = _ZERO
         
         return {
             'total_profit_after_tax': {
@@ -281,8 +268,8 @@ class FinancialComprehensiveModule:
         
         # 计算资产负债率（简化）
         # 假设借款占总投资的70%
-        total_debt = round_decimal(float(results.total_investment * Decimal('0.7')))
-        debt_ratio = round_decimal(float(total_debt / results.total_investment * Decimal('100')))
+        total_debt = round_decimal(results.total_investment * Decimal('0.7'))
+        debt_ratio = round_decimal(total_debt / results.total_investment * Decimal('100'))
         
         return {
             'total_debt': {
@@ -1,30 +1,125 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import List, Dict, Optional
-from decimal import Decimal, getcontext, ROUND_HALF_UP
-import copy
+from decimal import Context, Decimal, ROUND_HALF_UP
+import functools
+import numpy as np
 
-# 设置Decimal精度，确保小数点后2位精确计算
-getcontext().prec = 10
-getcontext().rounding = ROUND_HALF_UP
+# 模块专用的Decimal上下文，不修改线程全局上下文
+_CTX = Context(prec=28, rounding=ROUND_HALF_UP)
+
+_ZERO = Decimal('0')
+
+# 按年份存储的收入、成本字段
+_REVENUE_STREAMS = (
+    'factory_building_revenue', 'supporting_facility_revenue',
+    'property_service_revenue', 'parking_revenue',
+    'advertising_revenue', 'asset_sale_revenue'
+)
+_COST_STREAMS = (
+    'material_cost', 'fuel_power_cost', 'labor_cost',
+    'repair_cost', 'other_cost'
+)
+
+# 保存/加载时读写的标量字段（缺省值取自各数据类的默认值）
+_INVESTMENT_FIELDS = (
+    'building_cost', 'equipment_procurement_cost', 'equipment_installation_cost',
+    'public_equipment_procurement_cost', 'public_equipment_installation_cost',
+    'construction_management_fee', 'technical_consulting_fee', 'infrastructure_fee',
+    'land_use_fee', 'patent_fee', 'other_preparation_fee',
+    'basic_contingency_reserve', 'price_contingency_reserve',
+    'construction_interest', 'working_capital'
+)
+_TAX_RATE_FIELDS = (
+    'vat_output_rate', 'vat_input_rate', 'city_maintenance_tax_rate',
+    'education_surtax_rate', 'income_tax_rate'
+)
+_PARAMETER_RATE_FIELDS = ('tax_rate', 'surplus_reserve_rate', 'discount_rate')
+
+
+@functools.lru_cache(maxsize=8)
+def _quantizer(decimal_places: int) -> Decimal:
+    """获取指定小数位数的量化单位，如2位小数对应Decimal('0.01')"""
+    return Decimal('1').scaleb(-decimal_places)
 
 
 def round_decimal(value: float, decimal_places: int = 2) -> Decimal:
     """将数值四舍五入到指定小数位数"""
     if isinstance(value, Decimal):
-        return value.quantize(Decimal('1').scaleb(-decimal_places), rounding=ROUND_HALF_UP)
-    return Decimal(str(value)).quantize(Decimal('1').scaleb(-decimal_places), rounding=ROUND_HALF_UP)
+        d = value
+    elif isinstance(value, int):
+        d = Decimal(value)
+    else:
+        # float按最短十进制表示转换，保证1.005等边界值按书面值四舍五入
+        d = Decimal(str(value))
+    return _CTX.quantize(d, _quantizer(decimal_places))
+
+
+def _to_decimal_rounded(arr: np.ndarray, decimal_places: int = 2) -> List[Decimal]:
+    """将float64数组转换回四舍五入后的Decimal列表（仅在输出边界使用）"""
+    return [round_decimal(value, decimal_places) for value in arr.tolist()]
+
+
+def _truncate(d: Dict[int, Decimal], n: int) -> Dict[int, Decimal]:
+    """丢弃超出计算期的年份数据"""
+    return {y: v for y, v in d.items() if y <= n}
+
+
+@functools.lru_cache(maxsize=32)
+def _discount_factors(discount_rate: float, total_period: int) -> np.ndarray:
+    """各年折现系数 1/(1+r)^t，t从0开始（第1年不折现），结果只读以便缓存共享"""
+    factors = np.power(1.0 + discount_rate, -np.arange(total_period, dtype=np.float64))
+    factors.flags.writeable = False
+    return factors
+
+
+def _dump_floats(source, names) -> Dict[str, float]:
+    """按字段表将Decimal字段导出为float"""
+    return {name: float(getattr(source, name)) for name in names}
+
+
+def _dump_year_dict(data: Dict[int, Decimal]) -> Dict[int, float]:
+    """导出按年份存储的字典"""
+    return {k: float(v) for k, v in data.items()}
+
+
+def _load_decimals(data: Dict, names) -> Dict[str, Decimal]:
+    """按字段表从字典读取Decimal字段，缺失的字段不返回（保留默认值）"""
+    return {name: Decimal(str(data[name])) for name in names if name in data}
+
+
+def _load_year_dict(data: Dict) -> Dict[int, Decimal]:
+    """加载按年份存储的字典（JSON中的年份键为字符串）"""
+    return {int(k): Decimal(str(v)) for k, v in data.items()}
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProjectPeriod:
-    """项目期间管理类"""
+    """项目期间管理类（不可变，修改期间时整体替换）"""
     construction_period: int = 3  # 建设期（年）
     operation_period: int = 17   # 运营期（年）
     
+    # 派生值缓存，实例不可变，创建时计算一次
+    _total: int = field(init=False, repr=False, compare=False)
+    _years_range: range = field(init=False, repr=False, compare=False)
+    _construction_range: range = field(init=False, repr=False, compare=False)
+    _operation_range: range = field(init=False, repr=False, compare=False)
+    _operation_mask: np.ndarray = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # frozen数据类只能通过object.__setattr__写入缓存字段
+        total = self.construction_period + self.operation_period
+        object.__setattr__(self, '_total', total)
+        object.__setattr__(self, '_years_range', range(1, total + 1))
+        object.__setattr__(self, '_construction_range', range(1, self.construction_period + 1))
+        object.__setattr__(self, '_operation_range', range(self.construction_period + 1, total + 1))
+        operation_mask = np.arange(total) >= self.construction_period
+        operation_mask.flags.writeable = False
+        object.__setattr__(self, '_operation_mask', operation_mask)
+    
     @property
     def total_period(self) -> int:
         """计算期（年）"""
-        return self.construction_period + self.operation_period
+        return self._total
     
     @property
     def operation_start_year(self) -> int:
@@ -34,25 +129,30 @@ class ProjectPeriod:
     @property
     def years_range(self) -> range:
         """年份范围"""
-        return range(1, self.total_period + 1)
+        return self._years_range
     
     @property
     def construction_years_range(self) -> range:
         """建设期年份范围"""
-        return range(1, self.construction_period + 1)
+        return self._construction_range
     
     @property
     def operation_years_range(self) -> range:
         """运营期年份范围"""
-        return range(self.operation_start_year, self.total_period + 1)
+        return self._operation_range
+    
+    @property
+    def operation_mask(self) -> np.ndarray:
+        """各年是否为运营期的只读布尔数组（下标0对应第1年）"""
+        return self._operation_mask
     
     def is_construction_year(self, year: int) -> bool:
         """判断是否为建设期年份"""
-        return year in self.construction_years_range
+        return 1 <= year <= self.construction_period
     
     def is_operation_year(self, year: int) -> bool:
         """判断是否为运营期年份"""
-        return year in self.operation_years_range
+        return self.construction_period < year <= self._total
     
     def get_year_label(self, year: int) -> str:
         """获取年份标签"""
@@ -66,7 +166,7 @@ class ProjectPeriod:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProjectBasicInfo:
     """项目基本信息"""
     project_name: str = "东兴电子产业园三期项目财务分析"
@@ -76,7 +176,7 @@ class ProjectBasicInfo:
     prior_work_years: int = 20
 
 
-@dataclass
+@dataclass(slots=True)
 class InvestmentData:
     """项目投资数据"""
     # 工程费
@@ -105,7 +205,7 @@ class InvestmentData:
     working_capital: Decimal = Decimal('90')  # 流动资金
 
 
-@dataclass
+@dataclass(slots=True)
 class AssetData:
     """资产数据"""
     fixed_assets_original_value: Decimal = Decimal('0')  # 固定资产原值（不含建设期利息）
@@ -127,7 +227,7 @@ class AssetData:
     deductible_tax: Decimal = Decimal('8716.8199')  # 可抵扣建设投资进项税
 
 
-@dataclass
+@dataclass(slots=True)
 class RevenueData:
     """收入数据"""
     # 标准厂房收入（按年份）
@@ -155,7 +255,7 @@ class RevenueData:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CostData:
     """成本数据"""
     # 外购原材料成本（按年份）
@@ -180,7 +280,7 @@ class CostData:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TaxData:
     """税费数据"""
     # 税率参数
@@ -195,18 +295,26 @@ class TaxData:
     subsidy_income: Dict[int, Decimal] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FinancialParameters:
     """财务参数"""
     tax_rate: Decimal = Decimal('0.25')  # 企业所得税税率
     surplus_reserve_rate: Decimal = Decimal('0.1')  # 盈余公积金比率
     discount_rate: Decimal = Decimal('0.06')  # 折现率（内部收益率ic）
     loss_offset_years: int = 5  # 亏损弥补年限
+    
+    def discount_factors(self, total_period: int) -> np.ndarray:
+        """获取各年折现系数数组（按折现率和计算期缓存）"""
+        return _discount_factors(float(self.discount_rate), total_period)
 
 
-@dataclass
+@dataclass(slots=True)
 class CalculationResults:
-    """计算结果数据"""
+    """计算结果数据
+    
+    各年数组保留Decimal以保证金额精确到分，需要向量化运算时
+    通过to_float_array获取float64视图，再用_to_decimal_rounded写回。
+    """
     # 期间信息
     construction_period: int = 3
     operation_period: int = 17
@@ -247,30 +355,41 @@ class CalculationResults:
     static_payback_period: Optional[float] = None  # 静态投资回收期
     dynamic_payback_period: Optional[float] = None  # 动态投资回收期
     
+    # 按年份存储的数组字段
+    ARRAY_FIELDS = (
+        'fixed_assets_investment', 'working_capital_investment',
+        'annual_depreciation', 'annual_amortization',
+        'annual_revenue', 'annual_cost', 'annual_profit_before_tax',
+        'annual_income_tax', 'annual_profit_after_tax',
+        'annual_vat_output', 'annual_vat_input', 'annual_vat_paid',
+        'annual_city_maintenance_tax', 'annual_education_surtax',
+        'annual_cash_flow_in', 'annual_cash_flow_out',
+        'annual_net_cash_flow', 'cumulative_cash_flow'
+    )
+    
+    def to_float_array(self, name: str) -> np.ndarray:
+        """获取某个年份数组的float64副本，供NumPy向量化计算使用"""
+        values = getattr(self, name)
+        return np.fromiter((float(v) for v in values), dtype=np.float64, count=len(values))
+    
+    def recompute_cumulative(self):
+        """由年度净现金流量一次性累加得到累计净现金流量"""
+        self.cumulative_cash_flow = _to_decimal_rounded(
+            np.cumsum(self.to_float_array('annual_net_cash_flow'))
+        )
+    
+    def clone(self) -> 'CalculationResults':
+        """复制计算结果（Decimal不可变，只需复制列表）"""
+        return replace(self, **{name: list(getattr(self, name)) for name in self.ARRAY_FIELDS})
+    
     def initialize_arrays(self, total_period: int):
         """初始化所有数组"""
-        zeros = [Decimal('0')] * total_period
-        self.fixed_assets_investment = zeros.copy()
-        self.working_capital_investment = zeros.copy()
-        self.annual_depreciation = zeros.copy()
-        self.annual_amortization = zeros.copy()
-        self.annual_revenue = zeros.copy()
-        self.annual_cost = zeros.copy()
-        self.annual_profit_before_tax = zeros.copy()
-        self.annual_income_tax = zeros.copy()
-        self.annual_profit_after_tax = zeros.copy()
-        self.annual_vat_output = zeros.copy()
-        self.annual_vat_input = zeros.copy()
-        self.annual_vat_paid = zeros.copy()
-        self.annual_city_maintenance_tax = zeros.copy()
-        self.annual_education_surtax = zeros.copy()
-        self.annual_cash_flow_in = zeros.copy()
-        self.annual_cash_flow_out = zeros.copy()
-        self.annual_net_cash_flow = zeros.copy()
-        self.cumulative_cash_flow = zeros.copy()
-
-
-@dataclass
+        # Decimal不可变，各数组可共享同一个零值对象
+        for name in self.ARRAY_FIELDS:
+            setattr(self, name, [_ZERO] * total_period)
+
+
+@dataclass(slots=True)
 class FinancialModel:
     """财务模型数据容器"""
     # 项目期间
@@ -309,106 +428,55 @@ class FinancialModel:
     
     def update_period(self, construction_period: int, operation_period: int):
         """更新项目期间并迁移数据"""
-        old_period = copy.deepcopy(self.period)
-        
         # 更新期间
-        self.period.construction_period = construction_period
-        self.period.operation_period = operation_period
+        self.period = ProjectPeriod(construction_period, operation_period)
         
         # 更新基本信息
-        self.basic_info.construction_period = construction_period
-        self.basic_info.operation_period = operation_period
-        self.basic_info.calculation_period = self.period.total_period
+        self.basic_info = replace(
+            self.basic_info,
+            construction_period=construction_period,
+            operation_period=operation_period,
+            calculation_period=self.period.total_period
+        )
         
         # 迁移年份数据
-        self._migrate_year_data(old_period)
+        self._migrate_year_data()
         
         # 初始化结果
         self.initialize_results()
     
-    def _migrate_year_data(self, old_period: ProjectPeriod):
+    def _migrate_year_data(self):
         """迁移年份数据，保留可用的历史数据"""
         new_total = self.period.total_period
         
         # 迁移收入数据
-        for year, value in self.revenue.factory_building_revenue.items():
-            if year <= new_total:
-                self.revenue.factory_building_revenue[year] = value
-            else:
-                del self.revenue.factory_building_revenue[year]
-        
-        for year, value in self.revenue.supporting_facility_revenue.items():
-            if year <= new_total:
-                self.revenue.supporting_facility_revenue[year] = value
-            else:
-                del self.revenue.supporting_facility_revenue[year]
+        for name in _REVENUE_STREAMS:
+            setattr(self.revenue, name, _truncate(getattr(self.revenue, name), new_total))
         
         # 迁移成本数据
-        for year, value in self.cost.material_cost.items():
-            if year <= new_total:
-                self.cost.material_cost[year] = value
-            else:
-                del self.cost.material_cost[year]
+        for name in _COST_STREAMS:
+            setattr(self.cost, name, _truncate(getattr(self.cost, name), new_total))
         
-        for year, value in self.cost.labor_cost.items():
-            if year <= new_total:
-                self.cost.labor_cost[year] = value
-            else:
-                del self.cost.labor_cost[year]
+        # 迁移补贴收入
+        self.tax.subsidy_income = _truncate(self.tax.subsidy_income, new_total)
     
     def to_dict(self) -> Dict:
         """转换为字典，用于保存"""
+        tax = _dump_floats(self.tax, _TAX_RATE_FIELDS)
+        tax['subsidy_income'] = _dump_year_dict(self.tax.subsidy_income)
+        parameters = _dump_floats(self.parameters, _PARAMETER_RATE_FIELDS)
+        parameters['loss_offset_years'] = self.parameters.loss_offset_years
+        
         return {
             'period': {
                 'construction_period': self.period.construction_period,
                 'operation_period': self.period.operation_period
             },
-            'investment': {
-                'building_cost': float(self.investment.building_cost),
-                'equipment_procurement_cost': float(self.investment.equipment_procurement_cost),
-                'equipment_installation_cost': float(self.investment.equipment_installation_cost),
-                'public_equipment_procurement_cost': float(self.investment.public_equipment_procurement_cost),
-                'public_equipment_installation_cost': float(self.investment.public_equipment_installation_cost),
-                'construction_management_fee': float(self.investment.construction_management_fee),
-                'technical_consulting_fee': float(self.investment.technical_consulting_fee),
-                'infrastructure_fee': float(self.investment.infrastructure_fee),
-                'land_use_fee': float(self.investment.land_use_fee),
-                'patent_fee': float(self.investment.patent_fee),
-                'other_preparation_fee': float(self.investment.other_preparation_fee),
-                'basic_contingency_reserve': float(self.investment.basic_contingency_reserve),
-                'price_contingency_reserve': float(self.investment.price_contingency_reserve),
-                'construction_interest': float(self.investment.construction_interest),
-                'working_capital': float(self.investment.working_capital)
-            },
-            'revenue': {
-                'factory_building_revenue': {k: float(v) for k, v in self.revenue.factory_building_revenue.items()},
-                'supporting_facility_revenue': {k: float(v) for k, v in self.revenue.supporting_facility_revenue.items()},
-                'property_service_revenue': {k: float(v) for k, v in self.revenue.property_service_revenue.items()},
-                'parking_revenue': {k: float(v) for k, v in self.revenue.parking_revenue.items()},
-                'advertising_revenue': {k: float(v) for k, v in self.revenue.advertising_revenue.items()},
-                'asset_sale_revenue': {k: float(v) for k, v in self.revenue.asset_sale_revenue.items()}
-            },
-            'cost': {
-                'material_cost': {k: float(v) for k, v in self.cost.material_cost.items()},
-                'fuel_power_cost': {k: float(v) for k, v in self.cost.fuel_power_cost.items()},
-                'labor_cost': {k: float(v) for k, v in self.cost.labor_cost.items()},
-                'repair_cost': {k: float(v) for k, v in self.cost.repair_cost.items()},
-                'other_cost': {k: float(v) for k, v in self.cost.other_cost.items()}
-            },
-            'tax': {
-                'vat_output_rate': float(self.tax.vat_output_rate),
-                'vat_input_rate': float(self.tax.vat_input_rate),
-                'city_maintenance_tax_rate': float(self.tax.city_maintenance_tax_rate),
-                'education_surtax_rate': float(self.tax.education_surtax_rate),
-                'income_tax_rate': float(self.tax.income_tax_rate),
-                'subsidy_income': {k: float(v) for k, v in self.tax.subsidy_income.items()}
-            },
-            'parameters': {
-                'tax_rate': float(self.parameters.tax_rate),
-                'surplus_reserve_rate': float(self.parameters.surplus_reserve_rate),
-                'discount_rate': float(self.parameters.discount_rate),
-                'loss_offset_years': self.parameters.loss_offset_years
-            }
+            'investment': _dump_floats(self.investment, _INVESTMENT_FIELDS),
+            'revenue': {name: _dump_year_dict(getattr(self.revenue, name)) for name in _REVENUE_STREAMS},
+            'cost': {name: _dump_year_dict(getattr(self.cost, name)) for name in _COST_STREAMS},
+            'tax': tax,
+            'parameters': parameters
         }
     
     @classmethod
@@ -418,64 +486,46 @@ class FinancialModel:
         
         # 恢复期间
         if 'period' in data:
-            model.period.construction_period = data['period'].get('construction_period', 3)
-            model.period.operation_period = data['period'].get('operation_period', 17)
+            model.period = ProjectPeriod(
+                data['period'].get('construction_period', 3),
+                data['period'].get('operation_period', 17)
+            )
         
         # 恢复投资数据
         if 'investment' in data:
-            inv_data = data['investment']
-            model.investment.building_cost = Decimal(str(inv_data.get('building_cost', 67062.86)))
-            model.investment.equipment_procurement_cost = Decimal(str(inv_data.get('equipment_procurement_cost', 2360.38)))
-            model.investment.equipment_installation_cost = Decimal(str(inv_data.get('equipment_installation_cost', 18299.19)))
-            model.investment.public_equipment_procurement_cost = Decimal(str(inv_data.get('public_equipment_procurement_cost', 0)))
-            model.investment.public_equipment_installation_cost = Decimal(str(inv_data.get('public_equipment_installation_cost', 0)))
-            model.investment.construction_management_fee = Decimal(str(inv_data.get('construction_management_fee', 0)))
-            model.investment.technical_consulting_fee = Decimal(str(inv_data.get('technical_consulting_fee', 6036.83)))
-            model.investment.infrastructure_fee = Decimal(str(inv_data.get('infrastructure_fee', 1737.79)))
-            model.investment.land_use_fee = Decimal(str(inv_data.get('land_use_fee', 6505.72)))
-            model.investment.patent_fee = Decimal(str(inv_data.get('patent_fee', 0)))
-            model.investment.other_preparation_fee = Decimal(str(inv_data.get('other_preparation_fee', 323.19)))
-            model.investment.basic_contingency_reserve = Decimal(str(inv_data.get('basic_contingency_reserve', 10532.08)))
-            model.investment.price_contingency_reserve = Decimal(str(inv_data.get('price_contingency_reserve', 0)))
-            model.investment.construction_interest = Decimal(str(inv_data.get('construction_interest', 5721.185772330424)))
-            model.investment.working_capital = Decimal(str(inv_data.get('working_capital', 90)))
+            model.investment = replace(
+                model.investment, **_load_decimals(data['investment'], _INVESTMENT_FIELDS)
+            )
         
         # 恢复收入数据
         if 'revenue' in data:
             rev_data = data['revenue']
-            model.revenue.factory_building_revenue = {int(k): Decimal(str(v)) for k, v in rev_data.get('factory_building_revenue', {}).items()}
-            model.revenue.supporting_facility_revenue = {int(k): Decimal(str(v)) for k, v in rev_data.get('supporting_facility_revenue', {}).items()}
-            model.revenue.property_service_revenue = {int(k): Decimal(str(v)) for k, v in rev_data.get('property_service_revenue', {}).items()}
-            model.revenue.parking_revenue = {int(k): Decimal(str(v)) for k, v in rev_data.get('parking_revenue', {}).items()}
-            model.revenue.advertising_revenue = {int(k): Decimal(str(v)) for k, v in rev_data.get('advertising_revenue', {}).items()}
-            model.revenue.asset_sale_revenue = {int(k): Decimal(str(v)) for k, v in rev_data.get('asset_sale_revenue', {}).items()}
+            for name in _REVENUE_STREAMS:
+                setattr(model.revenue, name, _load_year_dict(rev_data.get(name, {})))
         
         # 恢复成本数据
         if 'cost' in data:
             cost_data = data['cost']
-            model.cost.material_cost = {int(k): Decimal(str(v)) for k, v in cost_data.get('material_cost', {}).items()}
-            model.cost.fuel_power_cost = {int(k): Decimal(str(v)) for k, v in cost_data.get('fuel_power_cost', {}).items()}
-            model.cost.labor_cost = {int(k): Decimal(str(v)) for k, v in cost_data.get('labor_cost', {}).items()}
-            model.cost.repair_cost = {int(k): Decimal(str(v)) for k, v in cost_data.get('repair_cost', {}).items()}
-            model.cost.other_cost = {int(k): Decimal(str(v)) for k, v in cost_data.get('other_cost', {}).items()}
+            for name in _COST_STREAMS:
+                setattr(model.cost, name, _load_year_dict(cost_data.get(name, {})))
         
         # 恢复税费数据
         if 'tax' in data:
             tax_data = data['tax']
-            model.tax.vat_output_rate = Decimal(str(tax_data.get('vat_output_rate', 0.09)))
-            model.tax.vat_input_rate = Decimal(str(tax_data.get('vat_input_rate', 0.13)))
-            model.tax.city_maintenance_tax_rate = Decimal(str(tax_data.get('city_maintenance_tax_rate', 0.07)))
-            model.tax.education_surtax_rate = Decimal(str(tax_data.get('education_surtax_rate', 0.05)))
-            model.tax.income_tax_rate = Decimal(str(tax_data.get('income_tax_rate', 0.25)))
-            model.tax.subsidy_income = {int(k): Decimal(str(v)) for k, v in tax_data.get('subsidy_income', {}).items()}
+            model.tax = replace(
+                model.tax,
+                subsidy_income=_load_year_dict(tax_data.get('subsidy_income', {})),
+                **_load_decimals(tax_data, _TAX_RATE_FIELDS)
+            )
         
         # 恢复财务参数
         if 'parameters' in data:
             param_data = data['parameters']
-            model.parameters.tax_rate = Decimal(str(param_data.get('tax_rate', 0.25)))
-            model.parameters.surplus_reserve_rate = Decimal(str(param_data.get('surplus_reserve_rate', 0.1)))
-            model.parameters.discount_rate = Decimal(str(param_data.get('discount_rate', 0.06)))
-            model.parameters.loss_offset_years = param_data.get('loss_offset_years', 5)
+            model.parameters = replace(
+                model.parameters,
+                loss_offset_years=param_data.get('loss_offset_years', 5),
+                **_load_decimals(param_data, _PARAMETER_RATE_FIELDS)
+            )
         
         # 初始化结果
         model.initialize_results()
@@ -0,0 +1,159 @@
+"""
+财务指标计算内核
+基于float64数组的IRR和投资回收期计算，亏损弥补递推，以及main.py简化模型的现金流计算，
+安装numba时使用JIT编译，未安装时以纯Python方式运行
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba为可选依赖
+    def njit(*args, **kwargs):
+        """numba不可用时的空装饰器"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True)
+def _npv(rate, cashflows):
+    """IRR迭代用的净现值，第1年（下标0）不折现"""
+    total = 0.0
+    factor = 1.0
+    for t in range(cashflows.shape[0]):
+        total += cashflows[t] / factor
+        factor *= 1.0 + rate
+    return total
+
+
+@njit(cache=True)
+def _npv_derivative(rate, cashflows):
+    """净现值对折现率的导数"""
+    total = 0.0
+    for t in range(1, cashflows.shape[0]):
+        total -= t * cashflows[t] / (1.0 + rate) ** (t + 1)
+    return total
+
+
+@njit(cache=True)
+def irr(cashflows, guess=0.1):
+    """计算内部收益率：先用牛顿迭代，不收敛时退回二分法，无解返回nan"""
+    tolerance = 1e-10
+    rate = guess
+    for _ in range(100):
+        value = _npv(rate, cashflows)
+        derivative = _npv_derivative(rate, cashflows)
+        if derivative == 0.0:
+            break
+        new_rate = rate - value / derivative
+        if new_rate <= -1.0:
+            break
+        if abs(new_rate - rate) < tolerance:
+            return new_rate
+        rate = new_rate
+
+    # 二分法兜底
+    lower_rate = -0.9
+    upper_rate = 1.0
+    npv_lower = _npv(lower_rate, cashflows)
+    if npv_lower * _npv(upper_rate, cashflows) > 0.0:
+        return np.nan
+    for _ in range(1000):
+        mid_rate = (lower_rate + upper_rate) / 2.0
+        npv_mid = _npv(mid_rate, cashflows)
+        if abs(npv_mid) < 1e-4 or upper_rate - lower_rate < tolerance:
+            return mid_rate
+        if (npv_mid > 0.0) == (npv_lower > 0.0):
+            lower_rate = mid_rate
+            npv_lower = npv_mid
+        else:
+            upper_rate = mid_rate
+    return (lower_rate + upper_rate) / 2.0
+
+
+@njit(cache=True)
+def payback(cashflows, cumulative_cashflows):
+    """计算投资回收期：累计净现金流量首次由负转正的年份插值，未回收返回nan"""
+    for t in range(1, cumulative_cashflows.shape[0]):
+        if cumulative_cashflows[t] >= 0.0 and cumulative_cashflows[t - 1] < 0.0:
+            if cashflows[t] != 0.0:
+                return t + abs(cumulative_cashflows[t - 1]) / abs(cashflows[t])
+    return np.nan
+
+
+# 声明签名后在导入时即完成编译（并写入磁盘缓存），避免Streamlit首次计算时等待JIT编译
+@njit('Tuple((f8[:], f8[:], f8, f8))(f8[:], f8[:], f8, i8, f8)', cache=True)
+def compute_flows(income, cost, fixed_assets_total, construction_period, discount_rate):
+    """
+    简化模型的现金流计算：建设期均匀投入固定资产，运营期按25%计算所得税
+    返回(净现金流量, 累计净现金流量, 净现值, 静态投资回收期)，未回收时回收期为nan
+    """
+    n = income.shape[0]
+    cash_flow = np.empty(n)
+    cumulative_cash_flow = np.empty(n)
+    investment_per_year = fixed_assets_total / construction_period
+    npv_value = 0.0
+    factor = 1.0
+    running = 0.0
+    payback_period = np.nan
+    # 用布尔标记记录是否已回收，不依赖NaN判断
+    recovered = False
+    for t in range(n):
+        if t < construction_period:
+            net = -investment_per_year
+        else:
+            profit_before_tax = income[t] - cost[t]
+            net = profit_before_tax - max(profit_before_tax, 0.0) * 0.25
+        cash_flow[t] = net
+        previous = running
+        running += net
+        cumulative_cash_flow[t] = running
+        npv_value += net / factor
+        factor *= 1.0 + discount_rate
+        if not recovered and t > 0 and running >= 0.0 and net != 0.0:
+            payback_period = t + abs(previous) / abs(net)
+            recovered = True
+    return cash_flow, cumulative_cash_flow, npv_value, payback_period
+
+
+@njit(cache=True)
+def taxable_profit(profit_before_tax, operation_mask, loss_offset_years):
+    """
+    亏损弥补：返回各年弥补以前年度亏损后的应纳税所得额（int64定点金额）
+    亏损按发生先后弥补，最多保留最近loss_offset_years笔未弥补亏损，用环形缓冲区存放
+    """
+    n = profit_before_tax.shape[0]
+    taxable = np.zeros(n, dtype=np.int64)
+    capacity = max(loss_offset_years, 1)
+    losses = np.zeros(capacity, dtype=np.int64)
+    head = 0
+    count = 0
+    for t in range(n):
+        if not operation_mask[t]:
+            continue
+        profit = profit_before_tax[t]
+        if profit >= 0:
+            # 有盈利，按时间顺序弥补以前年度亏损
+            remaining = profit
+            while count > 0 and remaining > 0:
+                loss = losses[head]
+                if loss <= remaining:
+                    remaining -= loss
+                    head = (head + 1) % capacity
+                    count -= 1
+                else:
+                    losses[head] = loss - remaining
+                    remaining = 0
+            taxable[t] = remaining
+        elif loss_offset_years > 0:
+            # 当年亏损，超过弥补年限的最早一笔亏损不再弥补
+            if count == capacity:
+                head = (head + 1) % capacity
+                count -= 1
+            losses[(head + count) % capacity] = -profit
+            count += 1
+    return taxable
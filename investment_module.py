@@ -1,9 +1,50 @@
 from decimal import Decimal
-from typing import List, Dict
+from typing import List, Dict, Tuple
+import functools
 from financial_core import FinancialModel, round_decimal, ProjectPeriod
 from financial_calculator import FinancialCalculatorBase
 
 
+# 投资汇总各组成部分对应的投资字段
+_ENGINEERING_FIELDS = (
+    'building_cost', 'equipment_procurement_cost', 'equipment_installation_cost',
+    'public_equipment_procurement_cost', 'public_equipment_installation_cost'
+)
+_OTHER_CONSTRUCTION_FIELDS = (
+    'construction_management_fee', 'technical_consulting_fee', 'infrastructure_fee',
+    'land_use_fee', 'patent_fee', 'other_preparation_fee'
+)
+_CONTINGENCY_FIELDS = ('basic_contingency_reserve', 'price_contingency_reserve')
+_SUMMARY_FIELDS = (
+    _ENGINEERING_FIELDS + _OTHER_CONSTRUCTION_FIELDS + _CONTINGENCY_FIELDS +
+    ('construction_interest', 'working_capital')
+)
+
+
+_ZERO = Decimal('0')
+_D04 = Decimal('0.4')
+_D03 = Decimal('0.3')
+
+
+@functools.lru_cache(maxsize=32)
+def _summarize_investment(values: Tuple[Decimal, ...]) -> Tuple[Decimal, Decimal, Decimal, Decimal]:
+    """按_SUMMARY_FIELDS顺序的投资数据计算(工程费, 工程建设其他费, 预备费, 项目总投资)"""
+    n_engineering = len(_ENGINEERING_FIELDS)
+    n_other = n_engineering + len(_OTHER_CONSTRUCTION_FIELDS)
+    n_contingency = n_other + len(_CONTINGENCY_FIELDS)
+    # Decimal精确求和，只在输出时四舍五入一次
+    engineering_cost = sum(values[:n_engineering], _ZERO)
+    other_construction_cost = sum(values[n_engineering:n_other], _ZERO)
+    contingency_reserve = sum(values[n_other:n_contingency], _ZERO)
+    total_project_investment = sum(values, _ZERO)
+    return (
+        round_decimal(engineering_cost),
+        round_decimal(other_construction_cost),
+        round_decimal(contingency_reserve),
+        round_decimal(total_project_investment)
+    )
+
+
 class InvestmentPlanCalculator(FinancialCalculatorBase):
     """投资计划计算器 - 对应工作表3"""
     
@@ -73,25 +114,18 @@ class InvestmentPlanCalculator(FinancialCalculatorBase):
     def _create_investment_schedule(self, investment: Dict[str, Decimal], 
                                      construction_years: int) -> Dict[str, List[Decimal]]:
         """创建年度投资计划"""
-        # 固定资产投资按建设期分配
+        # 固定资产投资按建设期分配（金额保持Decimal，避免float表示误差影响四舍五入）
         fixed_assets = investment['fixed_assets']
         if construction_years >= 3:
-            # 40%, 30%, 30%
-            fixed_assets_schedule = [
-                round_decimal(fixed_assets * Decimal('0.4')),
-                round_decimal(fixed_assets * Decimal('0.3')),
-                round_decimal(fixed_assets * Decimal('0.3'))
-            ]
-            if construction_years > 3:
-                # 超过3年的部分平均分配
-                remaining_years = construction_years - 3
-                if remaining_years > 0:
-                    avg_investment = round_decimal(fixed_assets * Decimal('0.3') / Decimal(remaining_years))
-                    fixed_assets_schedule.extend([avg_investment] * remaining_years)
+            # 40%, 30%, 30%，超过3年的部分按30%平均分配
+            remaining_years = construction_years - 3
+            amounts = [fixed_assets * _D04, fixed_assets * _D03, fixed_assets * _D03]
+            if remaining_years > 0:
+                amounts += [fixed_assets * _D03 / remaining_years] * remaining_years
         else:
             # 建设期少于3年，平均分配
-            avg_investment = round_decimal(fixed_assets / Decimal(construction_years))
-            fixed_assets_schedule = [avg_investment] * construction_years
+            amounts = [fixed_assets / construction_years] * construction_years
+        fixed_assets_schedule = [round_decimal(amount) for amount in amounts]
         
         return {
             'fixed_assets': fixed_assets_schedule[:construction_years],
@@ -158,58 +192,34 @@ class ProjectInvestmentSummaryCalculator(FinancialCalculatorBase):
     def calculate(self) -> bool:
         """计算项目投资汇总"""
         try:
-            inv = self.model.investment
-            assets = self.model.assets
             results = self.model.results
             
-            # 1. 工程费
-            engineering_cost = round_decimal(
-                inv.building_cost +
-                inv.equipment_procurement_cost +
-                inv.equipment_installation_cost +
-                inv.public_equipment_procurement_cost +
-                inv.public_equipment_installation_cost
-            )
-            
-            # 2. 工程建设其他费
-            other_construction_cost = round_decimal(
-                inv.construction_management_fee +
-                inv.technical_consulting_fee +
-                inv.infrastructure_fee +
-                inv.land_use_fee +
-                inv.patent_fee +
-                inv.other_preparation_fee
-            )
-            
-            # 3. 预备费
-            contingency_reserve = round_decimal(
-                inv.basic_contingency_reserve +
-                inv.price_contingency_reserve
-            )
-            
-            # 4. 建设期利息
-            construction_interest = inv.construction_interest
-            
-            # 5. 流动资金
-            working_capital = inv.working_capital
-            
-            # 项目总投资
-            total_project_investment = round_decimal(
-                engineering_cost +
-                other_construction_cost +
-                contingency_reserve +
-                construction_interest +
-                working_capital
-            )
+            # 工程费、工程建设其他费、预备费及项目总投资（按投资数据缓存）
+            summary = self.summarize()
             
             # 更新结果
-            results.total_investment = total_project_investment
+            results.total_investment = summary['total_investment']
             
             return True
             
         except Exception as e:
             print(f"项目投资汇总计算错误: {e}")
             return False
+    
+    def summarize(self) -> Dict[str, Decimal]:
+        """计算投资汇总各组成部分，投资数据不变时直接返回缓存结果"""
+        inv = self.model.investment
+        engineering_cost, other_construction_cost, contingency_reserve, total = _summarize_investment(
+            tuple(getattr(inv, name) for name in _SUMMARY_FIELDS)
+        )
+        return {
+            'engineering_cost': engineering_cost,
+            'other_construction_cost': other_construction_cost,
+            'contingency_reserve': contingency_reserve,
+            'construction_interest': inv.construction_interest,
+            'working_capital': inv.working_capital,
+            'total_investment': total
+        }
 
 
 class InvestmentModule:
@@ -254,32 +264,16 @@ class InvestmentModule:
     
     def get_investment_summary(self) -> Dict[str, Decimal]:
         """获取投资汇总数据"""
-        inv = self.model.investment
         assets = self.model.assets
+        summary = self.calculators['summary'].summarize()
         
         return {
-            'engineering_cost': round_decimal(
-                inv.building_cost +
-                inv.equipment_procurement_cost +
-                inv.equipment_installation_cost +
-                inv.public_equipment_procurement_cost +
-                inv.public_equipment_installation_cost
-            ),
-            'other_construction_cost': round_decimal(
-                inv.construction_management_fee +
-                inv.technical_consulting_fee +
-                inv.infrastructure_fee +
-                inv.land_use_fee +
-                inv.patent_fee +
-                inv.other_preparation_fee
-            ),
-            'contingency_reserve': round_decimal(
-                inv.basic_contingency_reserve +
-                inv.price_contingency_reserve
-            ),
-            'construction_interest': inv.construction_interest,
-            'working_capital': inv.working_capital,
+            'engineering_cost': summary['engineering_cost'],
+            'other_construction_cost': summary['other_construction_cost'],
+            'contingency_reserve': summary['contingency_reserve'],
+            'construction_interest': summary['construction_interest'],
+            'working_capital': summary['working_capital'],
             'fixed_assets_original_value': assets.fixed_assets_original_value,
             'fixed_assets_with_interest': assets.fixed_assets_with_interest,
             'total_investment': self.model.results.total_investment
-        }
\ No newline at end of file
+        }
@@ -1,100 +1,98 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import financial_kernels
 
-def calculate_financial_model():
+def read_model_inputs():
+    """从会话状态读取计算所需的全部输入，各年收入、成本以元组返回"""
     # 获取用户输入的数据
     construction_period = st.session_state.get('construction_period', 3)
     operation_period = st.session_state.get('operation_period', 17)
     total_period = construction_period + operation_period
     
+    # 收入数据 - 按年份输入，收入从第4年开始，默认值使用原始数据中的值
+    base_values = np.array([34384.75930731196, 34384.75930731196, 35769.15930731196, 15883.4, 15883.4, 
+                            17406.24, 17406.24, 17406.24, 19081.364000000005, 19081.364000000005, 
+                            19081.364000000005, 20924.000400000008, 20924.000400000008, 20924.000400000008, 
+                            22950.90044000001, 22950.90044000001])
+    income_defaults = np.zeros(total_period)
+    income_defaults[3:4] = 21127.586435770652
+    income_defaults[4:20] = base_values[:max(min(total_period, 20) - 4, 0)]
+    income = np.fromiter(
+        (st.session_state.get(f"income_year_{y}", income_defaults[y - 1]) for y in range(1, total_period + 1)),
+        dtype=np.float64, count=total_period
+    )
+    
+    # 成本数据 - 按年份输入，成本从第4年开始，这里我们假设成本为收入的10%
+    cost_defaults = income * 0.1
+    cost_defaults[:3] = 0.0
+    cost = np.fromiter(
+        (st.session_state.get(f"cost_year_{y}", cost_defaults[y - 1]) for y in range(1, total_period + 1)),
+        dtype=np.float64, count=total_period
+    )
+    
+    return {
+        'construction_period': construction_period,
+        'operation_period': operation_period,
+        # 项目投资部分 - 需要用户输入的数据
+        'building_cost': st.session_state.get('building_cost', 67062.86),  # 1.1 建筑工程费
+        'equipment_procurement_cost': st.session_state.get('equipment_procurement_cost', 0),  # 1.3.1 生产设备购置费
+        'equipment_installation_cost': st.session_state.get('equipment_installation_cost', 18299.19),  # 1.3.2 生产设备安装费
+        'other_construction_costs': st.session_state.get('other_construction_costs', 16870.944),  # 工程建设其他费
+        'contingency_reserve': st.session_state.get('contingency_reserve', 10532.08),  # 预备费
+        'construction_interest': st.session_state.get('construction_interest', 5721.185772330424),  # 建设期利息
+        'discount_rate': st.session_state.get('discount_rate', 0.06),
+        'incomes': tuple(income.tolist()),
+        'costs': tuple(cost.tolist())
+    }
+
+
+@st.cache_data(max_entries=32)
+def calculate_financial_model(construction_period, operation_period,
+                              building_cost, equipment_procurement_cost, equipment_installation_cost,
+                              other_construction_costs, contingency_reserve, construction_interest,
+                              discount_rate, incomes, costs):
+    """计算财务模型，所有输入显式传入，相同输入直接返回缓存结果"""
+    total_period = construction_period + operation_period
+    
     # 初始化所有年份的数据
     years = list(range(1, total_period + 1))
     
-    # 项目投资部分 - 需要用户输入的数据
-    building_cost = st.session_state.get('building_cost', 67062.86)  # 1.1 建筑工程费
-    equipment_procurement_cost = st.session_state.get('equipment_procurement_cost', 0)  # 1.3.1 生产设备购置费
-    equipment_installation_cost = st.session_state.get('equipment_installation_cost', 18299.19)  # 1.3.2 生产设备安装费
-    other_construction_costs = st.session_state.get('other_construction_costs', 16870.944)  # 工程建设其他费
-    contingency_reserve = st.session_state.get('contingency_reserve', 10532.08)  # 预备费
-    construction_interest = st.session_state.get('construction_interest', 5721.185772330424)  # 建设期利息
-    working_capital = st.session_state.get('working_capital', 90)  # 流动资金
-    
     # 资产形成计算
     fixed_assets_total = building_cost + equipment_procurement_cost + equipment_installation_cost + other_construction_costs + contingency_reserve + construction_interest
-    intangible_assets = st.session_state.get('intangible_assets', 6505.72)  # 无形资产
-    other_assets = st.session_state.get('other_assets', 294.1029)  # 其他资产
-    deductible_tax = st.session_state.get('deductible_tax', 8716.8199)  # 可抵扣建设投资进项税
     
-    # 收入数据 - 按年份输入
-    income_years = {}
-    for i in range(4, total_period + 1):  # 收入从第4年开始
-        key = f"income_year_{i}"
-        # 默认值使用原始数据中的值
-        if i == 4:
-            default_val = 21127.586435770652
-        elif i <= 20:
-            # 根据运营年份提供不同的默认值
-            base_values = [34384.75930731196, 34384.75930731196, 35769.15930731196, 15883.4, 15883.4, 
-                          17406.24, 17406.24, 17406.24, 19081.364000000005, 19081.364000000005, 
-                          19081.364000000005, 20924.000400000008, 20924.000400000008, 20924.000400000008, 
-                          22950.90044000001, 22950.90044000001]
-            idx = min(i-5, len(base_values)-1)  # 确保不越界
-            default_val = base_values[idx]
-        else:
-            default_val = 0
-        income_years[key] = st.session_state.get(key, default_val)
-    
-    # 成本数据 - 按年份输入
-    cost_years = {}
-    for i in range(4, total_period + 1):  # 成本从第4年开始
-        key = f"cost_year_{i}"
-        # 默认值使用原始数据中的值，这里我们假设成本为收入的一定比例
-        if i >= 4:
-            default_val = income_years[f"income_year_{i}"] * 0.1  # 假设成本是收入的10%
-        else:
-            default_val = 0
-        cost_years[key] = st.session_state.get(key, default_val)
-    
-    # 计算现金流
-    cash_flow = []
-    cumulative_cash_flow = []
-    for i in range(total_period):
-        year_idx = i + 1
-        
-        if year_idx <= construction_period:
-            # 建设期只有支出，没有收入
-            net_cash_flow = -(fixed_assets_total / construction_period)  # 假设投资均匀投入
-        else:
-            # 运营期
-            income_key = f"income_year_{year_idx}"
-            cost_key = f"cost_year_{year_idx}"
-            income = st.session_state.get(income_key, income_years[income_key])
-            cost = st.session_state.get(cost_key, cost_years[cost_key])
-            
-            # 计算税费
-            profit_before_tax = income - cost
-            income_tax = max(0, profit_before_tax * 0.25)  # 所得税25%
-            
-            net_cash_flow = income - cost - income_tax
-            
-        cash_flow.append(net_cash_flow)
-        
-        # 累计现金流
-        if i == 0:
-            cumulative_cash_flow.append(net_cash_flow)
-        else:
-            cumulative_cash_flow.append(cumulative_cash_flow[-1] + net_cash_flow)
+    # 建设期只有支出，没有收入，假设投资均匀投入；运营期按25%计算所得税
+    net_cash_flow, cumulative, npv, payback_period = financial_kernels.compute_flows(
+        np.asarray(incomes, dtype=np.float64), np.asarray(costs, dtype=np.float64),
+        float(fixed_assets_total), int(construction_period), float(discount_rate)
+    )
+    cash_flow = net_cash_flow.tolist()
+    cumulative_cash_flow = cumulative.tolist()
     
     return {
         'years': years,
         'cash_flow': cash_flow,
         'cumulative_cash_flow': cumulative_cash_flow,
+        'npv': float(npv),
+        'payback_period': None if np.isnan(payback_period) else float(payback_period),
         'construction_period': construction_period,
         'operation_period': operation_period,
         'total_period': total_period
     }
 
+@st.cache_data
+def _income_defaults(construction_period, operation_period):
+    """各年标准厂房收入默认值，按建设期和运营期缓存，建设期为0"""
+    year_idx = np.arange(construction_period + operation_period)
+    defaults = np.select(
+        [year_idx < 3, year_idx < 5, year_idx < 10, year_idx < 15, year_idx < 20],
+        [10824.0, 9840.0, 10824.0, 13097.040000000003, 15847.418400000006],
+        0.0
+    )
+    defaults[:construction_period] = 0.0
+    return defaults
+
+
 def render_input_form():
     st.title("建设项目经济评价系统")
     st.subheader("建筑工程财务模型参数")
@@ -211,6 +209,7 @@ def render_input_form():
         construction_period = st.session_state.get('construction_period', 3)
         operation_period = st.session_state.get('operation_period', 17)
         total_period = construction_period + operation_period
+        income_defaults = _income_defaults(construction_period, operation_period).tolist()
         
         # 显示年份标题
         cols = st.columns(total_period + 3)  # +3是为了容纳前面的列
@@ -241,31 +240,22 @@ def render_input_form():
                 else:
                     # 提供运营期收入输入
                     key = f"income_year_{i+1}"
-                    # 设置默认值
-                    if i == 3:  # 第4年
-                        default_val = 9840
-                    elif i == 4:
-                        default_val = 9840
-                    elif i == 5:
-                        default_val = 10824.0
-                    elif i < 10:
-                        default_val = 10824.0
-                    elif i < 15:
-                        default_val = 13097.040000000003
-                    elif i < 20:
-                        default_val = 15847.418400000006
-                    else:
-                        default_val = 0
-                    
                     st.number_input(
                         f"第{i+1}年收入",
-                        value=default_val,
+                        value=income_defaults[i],
                         key=key,
                         label_visibility="collapsed",
                         help=f"第{i+1}年标准厂房收入"
                     )
     
     with st.expander("经营成本", expanded=True):
+        # 使用收入的一个百分比作为默认成本，默认为收入的10%
+        incomes = np.fromiter(
+            (st.session_state.get(f"income_year_{i+1}", 0) for i in range(total_period)),
+            dtype=np.float64, count=total_period
+        )
+        cost_defaults = (incomes * 0.1).tolist()
+        
         # 经营成本输入区域
         cols = st.columns(total_period + 3)
         with cols[0]:
@@ -294,14 +284,9 @@ def render_input_form():
                     st.write("0")  # 建设期无成本
                 else:
                     key = f"cost_year_{i+1}"
-                    # 使用收入的一个百分比作为默认成本
-                    income_key = f"income_year_{i+1}"
-                    income_val = st.session_state.get(income_key, 0)
-                    
-                    default_cost = income_val * 0.1  # 默认为收入的10%
                     st.number_input(
                         f"第{i+1}年成本",
-                        value=default_cost,
+                        value=cost_defaults[i],
                         key=key,
                         label_visibility="collapsed",
                         help=f"第{i+1}年外购原材料成本"
@@ -316,48 +301,73 @@ def render_input_form():
             st.number_input("净现值内部收益率ic", value=0.06, key="discount_rate", step=0.01, help="净现值内部收益率ic")
 
 
+def calculate_irr(cash_flows):
+    """计算内部收益率：求现金流多项式的正实根，取最接近0的收益率；无解返回None"""
+    cf = np.trim_zeros(np.asarray(cash_flows, dtype=np.float64), 'f')
+    if cf.size < 2 or not ((cf > 0).any() and (cf < 0).any()):
+        return None
+    
+    # Σ cf_i / x^i = 0 两边乘x^(n-1)后为以cf为系数（高次在前）的多项式，x = 1 + IRR
+    try:
+        roots = np.roots(cf)
+        roots = roots[np.isreal(roots)].real
+        rates = roots[roots > 0] - 1
+        if rates.size:
+            return float(rates[np.argmin(np.abs(rates))])
+    except np.linalg.LinAlgError:
+        pass
+    
+    # 求根失败时用牛顿迭代兜底
+    years = np.arange(cf.size, dtype=np.float64)
+    rate = 0.1
+    for _ in range(100):
+        discounts = np.power(1.0 + rate, years)
+        value = (cf / discounts).sum()
+        derivative = (-years * cf / (discounts * (1.0 + rate))).sum()
+        if derivative == 0:
+            return None
+        new_rate = rate - value / derivative
+        if new_rate <= -1:
+            return None
+        if abs(new_rate - rate) < 1e-10:
+            return float(new_rate)
+        rate = new_rate
+    return None
+
+
 def display_results(results):
     st.subheader("财务分析结果")
+    cf = np.asarray(results['cash_flow'], dtype=np.float64)
+    cumulative_cf = np.asarray(results['cumulative_cash_flow'], dtype=np.float64)
     
     # 现金流量表
     st.write("### 现金流量表")
-    df_cf = pd.DataFrame({
-        '年份': results['years'],
-        '净现金流量': [round(cf, 2) for cf in results['cash_flow']],
-        '累计净现金流量': [round(cfcf, 2) for cfcf in results['cumulative_cash_flow']]
-    })
+    df_cf = pd.DataFrame(
+        np.round(np.stack([cf, cumulative_cf], axis=1), 2),
+        columns=['净现金流量', '累计净现金流量']
+    )
+    df_cf.insert(0, '年份', results['years'])
     
     st.dataframe(df_cf, width=1000)
     
-    # 计算NPV和IRR
-    discount_rate = st.session_state.get('discount_rate', 0.06)
-    cash_flows = results['cash_flow']
-    
-    # 计算NPV
-    npv = sum([cf / ((1 + discount_rate) ** i) for i, cf in enumerate(cash_flows, 0)])
-    
-    # 计算静态投资回收期
-    cumulative_cf = results['cumulative_cash_flow']
-    payback_period = None
-    for i, cum_cf in enumerate(cumulative_cf):
-        if cum_cf >= 0 and i > 0:
-            # 找到首次转正的年份
-            prev_cum_cf = cumulative_cf[i-1] if i > 0 else 0
-            if cash_flows[i] != 0:
-                payback_period = i + (abs(prev_cum_cf) / abs(cash_flows[i]))
-                break
+    # NPV和静态投资回收期已在calculate_financial_model中计算
+    npv = results['npv']
+    payback_period = results['payback_period']
     
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("净现值(NPV)", f"{npv:.2f}万元")
     with col2:
-        if payback_period:
+        if payback_period is not None:
             st.metric("静态投资回收期", f"{payback_period:.2f}年")
         else:
             st.metric("静态投资回收期", "未回收")
     with col3:
-        # IRR计算较复杂，这里简化处理或使用近似方法
-        st.metric("内部收益率(IRR)", "待计算")
+        irr = calculate_irr(cf)
+        if irr is not None:
+            st.metric("内部收益率(IRR)", f"{irr * 100:.2f}%")
+        else:
+            st.metric("内部收益率(IRR)", "无法计算")
 
 
 def main():
@@ -368,7 +378,7 @@ def main():
     
     # 计算按钮
     if st.button("计算"):
-        results = calculate_financial_model()
+        results = calculate_financial_model(**read_model_inputs())
         display_results(results)
 
 if __name__ == "__main__":
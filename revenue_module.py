@@ -1,61 +1,95 @@
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, List, Union
+import numpy as np
+import financial_kernels
 from financial_core import FinancialModel, round_decimal, ProjectPeriod
 from financial_calculator import FinancialCalculatorBase
 
 
+_ZERO = Decimal('0')
+# 常用小整数的Decimal，避免重复构造
+_SMALL_INT_DECIMALS = {0: _ZERO, 1: Decimal('1')}
+
+
 def to_decimal(value: Union[float, str, int, Decimal]) -> Decimal:
-    """将各种类型转换为Decimal"""
+    """将各种类型转换为Decimal，Decimal原样返回，常用小整数取缓存"""
     if isinstance(value, Decimal):
         return value
+    if type(value) is int:
+        cached = _SMALL_INT_DECIMALS.get(value)
+        return cached if cached is not None else Decimal(value)
     return Decimal(str(value))
 
 
+# 定点数比例：金额以0.0001万元为单位存为int64
+_FIXED_SCALE = 10000
+
+
+def to_fixed(value: Union[float, str, int, Decimal]) -> int:
+    """将金额转换为定点整数（四舍五入到0.0001）"""
+    return int((to_decimal(value) * _FIXED_SCALE).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_fixed(value: int) -> Decimal:
+    """将定点整数转换回保留2位小数的Decimal"""
+    return round_decimal(Decimal(int(value)) / _FIXED_SCALE)
+
+
+def _fixed_array(values, count: int) -> np.ndarray:
+    """将一组金额转换为定点int64数组"""
+    return np.fromiter((to_fixed(value) for value in values), dtype=np.int64, count=count)
+
+
+def _div_round(numerator: np.ndarray, denominator: int) -> np.ndarray:
+    """整数除法并按绝对值四舍五入（与ROUND_HALF_UP一致）"""
+    return np.sign(numerator) * ((np.abs(numerator) * 2 + denominator) // (2 * denominator))
+
+
 class RevenueTaxCalculator(FinancialCalculatorBase):
     """营业收入及税金计算器 - 对应工作表6"""
     
     def calculate(self) -> bool:
         """计算营业收入及税金"""
         try:
-            revenue_data = self.model.revenue
-            tax_data = self.model.tax
             results = self.model.results
+            total_period = self.period.total_period
             
-            for year_idx in range(self.period.total_period):
-                year = year_idx + 1
-                
-                if self.period.is_operation_year(year):
-                    # 计算各项收入
-                    factory_building = to_decimal(revenue_data.factory_building_revenue.get(year, Decimal('0')))
-                    supporting_facility = to_decimal(revenue_data.supporting_facility_revenue.get(year, Decimal('0')))
-                    property_service = to_decimal(revenue_data.property_service_revenue.get(year, Decimal('0')))
-                    parking = to_decimal(revenue_data.parking_revenue.get(year, Decimal('0')))
-                    advertising = to_decimal(revenue_data.advertising_revenue.get(year, Decimal('0')))
-                    asset_sale = to_decimal(revenue_data.asset_sale_revenue.get(year, Decimal('0')))
-                    
-                    # 计算总收入
-                    total_revenue = round_decimal(float(
-                        factory_building + supporting_facility + 
-                        property_service + parking + advertising + asset_sale
-                    ))
-                    results.annual_revenue[year_idx] = total_revenue
-                    
-                    # 计算销项税（根据不同税率）
-                    # 假设：厂房、配套用房、车位、广告、资产销售税率9%，物业费税率6%
-                    vat_output_9 = round_decimal(float(
-                        (factory_building + supporting_facility + parking + advertising + asset_sale) * 
-                        Decimal('0.09') / Decimal('1.09')
-                    ))
-                    vat_output_6 = round_decimal(float(
-                        property_service * Decimal('0.06') / Decimal('1.06')
-                    ))
-                    
-                    total_vat_output = round_decimal(float(vat_output_9 + vat_output_6))
-                    results.annual_vat_output[year_idx] = total_vat_output
-                else:
-                    # 建设期无收入
-                    results.annual_revenue[year_idx] = Decimal('0')
-                    results.annual_vat_output[year_idx] = Decimal('0')
+            # 各项收入展开为(6, 计算期)定点矩阵，行顺序：厂房、配套用房、物业费、车位、广告、资产销售
+            # 各项收入字典先绑定为局部变量，逐年取值时不再重复查找属性
+            revenue_data = self.model.revenue
+            years = range(1, total_period + 1)
+            revenues = np.stack([
+                _fixed_array((stream.get(year, _ZERO) for year in years), total_period)
+                for stream in (
+                    revenue_data.factory_building_revenue, revenue_data.supporting_facility_revenue,
+                    revenue_data.property_service_revenue, revenue_data.parking_revenue,
+                    revenue_data.advertising_revenue, revenue_data.asset_sale_revenue
+                )
+            ])
+            operation_mask = self.op_mask
+            
+            # 计算总收入（建设期无收入），整数求和无舍入误差
+            total_revenue = revenues.sum(axis=0) * operation_mask
+            
+            # 计算销项税（根据不同税率）
+            # 假设：厂房、配套用房、车位、广告、资产销售税率9%，物业费税率6%
+            # 9%与6%两部分通分为 (x9×9×106 + x6×6×109) / (109×106)，直接四舍五入到分
+            revenue_9 = revenues[[0, 1, 3, 4, 5]].sum(axis=0)
+            revenue_6 = revenues[2]
+            vat_output_cents = _div_round(
+                revenue_9 * (9 * 106) + revenue_6 * (6 * 109),
+                109 * 106 * (_FIXED_SCALE // 100)
+            ) * operation_mask
+            
+            # 每年只在写回时转换为Decimal
+            results.annual_revenue = [
+                from_fixed(value) if is_operation else _ZERO
+                for value, is_operation in zip(total_revenue.tolist(), operation_mask.tolist())
+            ]
+            results.annual_vat_output = [
+                Decimal(value).scaleb(-2) if is_operation else _ZERO
+                for value, is_operation in zip(vat_output_cents.tolist(), operation_mask.tolist())
+            ]
             
             return True
             
@@ -72,79 +106,47 @@ class ProfitCalculator(FinancialCalculatorBase):
         try:
             results = self.model.results
             tax_data = self.model.tax
-            parameters = self.model.parameters
-            revenue_data = self.model.revenue
+            total_period = self.period.total_period
             
-            cumulative_loss = Decimal('0')  # 累计亏损
-            loss_history = []  # 亏损历史记录
-            loss_offset_years = parameters.loss_offset_years
+            # 计算税前利润：收入 + 补贴 - 成本 - 折旧 - 摊销 - 城建税 - 教育费附加（定点整数运算）
+            subsidy = _fixed_array(
+                (tax_data.subsidy_income.get(year, 0) for year in range(1, total_period + 1)), total_period
+            )
+            profit_before_tax_fixed = (
+                _fixed_array(results.annual_revenue, total_period) +
+                subsidy -
+                _fixed_array(results.annual_cost, total_period) -
+                _fixed_array(results.annual_depreciation, total_period) -
+                _fixed_array(results.annual_amortization, total_period) -
+                _fixed_array(results.annual_city_maintenance_tax, total_period) -
+                _fixed_array(results.annual_education_surtax, total_period)
+            )
+            operation_mask = self.op_mask
             
-            for year_idx in range(self.period.total_period):
-                year = year_idx + 1
-                
-                if self.period.is_operation_year(year):
-                    # 计算补贴收入
-                    subsidy = to_decimal(tax_data.subsidy_income.get(year, Decimal('0')))
-                    
-                    # 计算税前利润
-                    profit_before_tax = round_decimal(float(
-                        results.annual_revenue[year_idx] +
-                        subsidy -
-                        results.annual_cost[year_idx] -
-                        results.annual_depreciation[year_idx] -
-                        results.annual_amortization[year_idx] -
-                        results.annual_city_maintenance_tax[year_idx] -
-                        results.annual_education_surtax[year_idx]
-                    ))
-                    
+            # 亏损弥补（逐年递推，由JIT内核完成）
+            taxable_fixed = financial_kernels.taxable_profit(
+                profit_before_tax_fixed, operation_mask, int(self.model.parameters.loss_offset_years)
+            )
+            
+            for year_idx in range(total_period):
+                if operation_mask[year_idx]:
+                    profit_before_tax = from_fixed(profit_before_tax_fixed[year_idx])
                     results.annual_profit_before_tax[year_idx] = profit_before_tax
                     
-                    # 亏损弥补逻辑
+                    # 计算所得税（当年亏损不交税）
                     if profit_before_tax >= 0:
-                        # 有盈利，先弥补以前年度亏损
-                        remaining_profit = profit_before_tax
-                        
-                        # 按时间顺序弥补亏损
-                        if loss_history:
-                            for i, loss in enumerate(loss_history[:loss_offset_years]):
-                                if remaining_profit > 0:
-                                    if loss <= remaining_profit:
-                                        remaining_profit -= loss
-                                        loss_history[i] = Decimal('0')
-                                    else:
-                                        loss_history[i] -= remaining_profit
-                                        remaining_profit = Decimal('0')
-                            
-                            # 移除已完全弥补的亏损
-                            loss_history = [loss for loss in loss_history if loss > 0]
-                        
-                        # 计算所得税
-                        income_tax = round_decimal(float(remaining_profit * tax_data.income_tax_rate))
+                        income_tax = round_decimal(from_fixed(taxable_fixed[year_idx]) * tax_data.income_tax_rate)
                     else:
-                        # 当年亏损，加入亏损历史
-                        loss_history.append(abs(profit_before_tax))
-                        if len(loss_history) > loss_offset_years:
-                            loss_history.pop(0)
-                        income_tax = Decimal('0')
-                    
+                        income_tax = _ZERO
                     results.annual_income_tax[year_idx] = income_tax
                     
                     # 计算税后利润
-                    profit_after_tax = round_decimal(float(profit_before_tax - income_tax))
-                    results.annual_profit_after_tax[year_idx] = profit_after_tax
-                    
-                    # 计算盈余公积金（税后利润的10%）
-                    surplus_reserve = round_decimal(float(
-                        profit_after_tax * parameters.surplus_reserve_rate
-                    ))
-                    
-                    # 计算应付利润（税后利润 - 盈余公积金）
-                    distributable_profit = round_decimal(float(profit_after_tax - surplus_reserve))
+                    results.annual_profit_after_tax[year_idx] = round_decimal(profit_before_tax - income_tax)
                 else:
                     # 建设期无利润
-                    results.annual_profit_before_tax[year_idx] = Decimal('0')
-                    results.annual_income_tax[year_idx] = Decimal('0')
-                    results.annual_profit_after_tax[year_idx] = Decimal('0')
+                    results.annual_profit_before_tax[year_idx] = _ZERO
+                    results.annual_income_tax[year_idx] = _ZERO
+                    results.annual_profit_after_tax[year_idx] = _ZERO
             
             return True
             
@@ -190,31 +192,29 @@ class RevenueModule:
         revenue_data = self.model.revenue
         results = self.model.results
         
+        # 一次遍历年份同时生成六个列表；字典中可能存有float（如直接赋值的测试数据），统一转换为Decimal
+        factory_building = revenue_data.factory_building_revenue
+        supporting_facility = revenue_data.supporting_facility_revenue
+        property_service = revenue_data.property_service_revenue
+        parking = revenue_data.parking_revenue
+        advertising = revenue_data.advertising_revenue
+        asset_sale = revenue_data.asset_sale_revenue
+        fb, sf, ps, pk, ad, asr = [], [], [], [], [], []
+        for year in range(1, self.period.total_period + 1):
+            fb.append(to_decimal(factory_building.get(year, _ZERO)))
+            sf.append(to_decimal(supporting_facility.get(year, _ZERO)))
+            ps.append(to_decimal(property_service.get(year, _ZERO)))
+            pk.append(to_decimal(parking.get(year, _ZERO)))
+            ad.append(to_decimal(advertising.get(year, _ZERO)))
+            asr.append(to_decimal(asset_sale.get(year, _ZERO)))
+        
         return {
-            'factory_building_revenue': [
-                to_decimal(revenue_data.factory_building_revenue.get(year, Decimal('0'))) 
-                for year in range(1, self.period.total_period + 1)
-            ],
-            'supporting_facility_revenue': [
-                to_decimal(revenue_data.supporting_facility_revenue.get(year, Decimal('0'))) 
-                for year in range(1, self.period.total_period + 1)
-            ],
-            'property_service_revenue': [
-                to_decimal(revenue_data.property_service_revenue.get(year, Decimal('0'))) 
-                for year in range(1, self.period.total_period + 1)
-            ],
-            'parking_revenue': [
-                to_decimal(revenue_data.parking_revenue.get(year, Decimal('0'))) 
-                for year in range(1, self.period.total_period + 1)
-            ],
-            'advertising_revenue': [
-                to_decimal(revenue_data.advertising_revenue.get(year, Decimal('0'))) 
-                for year in range(1, self.period.total_period + 1)
-            ],
-            'asset_sale_revenue': [
-                to_decimal(revenue_data.asset_sale_revenue.get(year, Decimal('0'))) 
-                for year in range(1, self.period.total_period + 1)
-            ],
+            'factory_building_revenue': fb,
+            'supporting_facility_revenue': sf,
+            'property_service_revenue': ps,
+            'parking_revenue': pk,
+            'advertising_revenue': ad,
+            'asset_sale_revenue': asr,
             'total_revenue': results.annual_revenue,
             'vat_output': results.annual_vat_output
         }
@@ -1,5 +1,10 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 from decimal import Decimal
-from typing import Dict, List, Tuple
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+import pickle
+import numpy as np
 import pandas as pd
 from financial_core import FinancialModel, round_decimal
 from investment_module import InvestmentModule
@@ -8,29 +13,128 @@ from revenue_module import RevenueModule
 from financial_comprehensive_module import FinancialComprehensiveModule
 
 
+# 敏感性分析中各因素调整的字段
+_REVENUE_FIELDS = (
+    'factory_building_revenue', 'supporting_facility_revenue', 'property_service_revenue',
+    'parking_revenue', 'advertising_revenue'
+)
+_COST_FIELDS = ('material_cost', 'fuel_power_cost', 'labor_cost', 'other_cost')
+_INVESTMENT_FIELDS = (
+    'building_cost', 'equipment_procurement_cost', 'equipment_installation_cost',
+    'public_equipment_procurement_cost', 'public_equipment_installation_cost',
+    'construction_management_fee', 'technical_consulting_fee', 'infrastructure_fee',
+    'basic_contingency_reserve', 'price_contingency_reserve'
+)
+
+
+def _snapshot_revenue(model: FinancialModel) -> Tuple[object, Dict]:
+    """保存收入调整前的各项收入"""
+    return model.revenue, {name: dict(getattr(model.revenue, name)) for name in _REVENUE_FIELDS}
+
+
+def _snapshot_cost(model: FinancialModel) -> Tuple[object, Dict]:
+    """保存成本调整前的各项成本"""
+    return model.cost, {name: dict(getattr(model.cost, name)) for name in _COST_FIELDS}
+
+
+def _snapshot_investment(model: FinancialModel) -> Tuple[object, Dict]:
+    """保存投资调整前的各项投资"""
+    return model.investment, {name: getattr(model.investment, name) for name in _INVESTMENT_FIELDS}
+
+
+def _snapshot_params(model: FinancialModel) -> Tuple[object, Dict]:
+    """保存折现率调整前的财务参数（不可变对象，保存引用即可）"""
+    return model, {'parameters': model.parameters}
+
+
+def _scale_dict(d: Dict[int, Decimal], multiplier: float):
+    """将按年份存储的金额整体乘以系数（一次数组乘法），结果四舍五入到分后写回原字典"""
+    # 直接遍历values()取值，不再按键逐个查找；只改值不增删键，键的顺序保持不变
+    values = np.fromiter(map(float, d.values()), dtype=np.float64, count=len(d))
+    values *= multiplier
+    for k, v in zip(d, values.tolist()):
+        d[k] = round_decimal(v)
+
+
+def _restore(snapshot: Tuple[object, Dict]):
+    """恢复快照中的字段，字典需复制一份，避免下次调整时改动快照"""
+    target, values = snapshot
+    for name, value in values.items():
+        setattr(target, name, dict(value) if isinstance(value, dict) else value)
+
+
+# 调整后不影响其结果、可沿用基准计算结果的模块（折现率只影响财务综合模块的NPV/IRR）
+_SKIP_MODULES = {
+    'discount_rate': ('investment', 'cost', 'revenue'),
+}
+
+_SNAPSHOTS = {
+    'revenue': _snapshot_revenue,
+    'cost': _snapshot_cost,
+    'investment': _snapshot_investment,
+    'discount_rate': _snapshot_params,
+}
+
+
 class SensitivityAnalyzer:
     """敏感性分析器"""
     
-    def __init__(self, model: FinancialModel):
+    def __init__(self, model: FinancialModel, max_workers: Optional[int] = 1):
+        """
+        Args:
+            model: 财务模型
+            max_workers: 进程数，默认1在当前进程中逐个计算；大于1或None（CPU核数）时使用进程池，
+                进程池在各次分析间复用，用完后调用close()或使用with语句释放
+        """
         self.model = model
         self.base_results = None
+        self.max_workers = max_workers
+        self._executor = None
     
-    def _calculate_model(self, modified_model: FinancialModel) -> Dict:
-        """计算修改后的模型"""
-        # 初始化结果
-        modified_model.initialize_results()
+    def __enter__(self) -> 'SensitivityAnalyzer':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """首次需要时创建进程池，之后复用"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+    
+    def _calculate_model(self, modified_model: FinancialModel, skip_modules: Tuple[str, ...] = ()) -> Dict:
+        """
+        计算修改后的模型
+        
+        Args:
+            modified_model: 待计算的模型
+            skip_modules: 跳过的模块，其结果沿用模型中已有的计算结果
+        """
+        # 初始化结果（跳过模块时需保留其已有结果）
+        if not skip_modules:
+            modified_model.initialize_results()
         
         # 执行投资模块计算
-        investment_module = InvestmentModule(modified_model)
-        investment_module.calculate_all()
+        if 'investment' not in skip_modules:
+            investment_module = InvestmentModule(modified_model)
+            investment_module.calculate_all()
         
         # 执行成本模块计算
-        cost_module = CostModule(modified_model)
-        cost_module.calculate_all()
+        if 'cost' not in skip_modules:
+            cost_module = CostModule(modified_model)
+            cost_module.calculate_all()
         
         # 执行收益模块计算
-        revenue_module = RevenueModule(modified_model)
-        revenue_module.calculate_all()
+        if 'revenue' not in skip_modules:
+            revenue_module = RevenueModule(modified_model)
+            revenue_module.calculate_all()
         
         # 执行财务综合模块计算
         financial_comprehensive_module = FinancialComprehensiveModule(modified_model)
@@ -69,25 +173,39 @@ class SensitivityAnalyzer:
         base_npv = self.base_results['npv']
         base_irr = self.base_results['irr']
         
+        take_snapshot = _SNAPSHOTS.get(factor)
+        if take_snapshot is None:
+            return {
+                'factor': factor,
+                'base_case': self.base_results,
+                'sensitivity_analysis': results
+            }
+        
+        # 变化为0即基准情况，直接复用基准结果，只计算其余变化幅度
+        pending = [change for change in percentage_changes if change != 0]
+        skip_modules = _SKIP_MODULES.get(factor, ())
+        if not pending:
+            variants = []
+        elif self.max_workers == 1:
+            variants = self._run_variants_inplace(factor, take_snapshot, pending, skip_modules)
+        else:
+            # 各变化幅度相互独立，模型只序列化一次，分发到多个进程计算（Decimal运算受GIL限制，不能用线程）
+            model_bytes = pickle.dumps(self.model)
+            variants = list(self._get_executor().map(
+                partial(_run_variant, model_bytes, factor, skip_modules), pending
+            ))
+        variants = iter(variants)
+        
         for change in percentage_changes:
-            # 创建模型的深拷贝
-            import copy
-            test_model = copy.deepcopy(self.model)
-            
-            # 应用变化
-            if factor == 'revenue':
-                self._apply_revenue_change(test_model, change)
-            elif factor == 'cost':
-                self._apply_cost_change(test_model, change)
-            elif factor == 'investment':
-                self._apply_investment_change(test_model, change)
-            elif factor == 'discount_rate':
-                self._apply_discount_rate_change(test_model, change)
-            else:
+            if change == 0:
+                result = dict(self.base_results)
+                result['change_percentage'] = change
+                result['npv_change'] = 0.0
+                result['npv_change_percentage'] = 0.0
+                result['irr_change'] = 0.0
+                results.append(result)
                 continue
-            
-            # 计算结果
-            result = self._calculate_model(test_model)
+            result = next(variants)
             result['change_percentage'] = change
             result['npv_change'] = result['npv'] - base_npv
             result['npv_change_percentage'] = (result['npv'] - base_npv) / abs(base_npv) * 100 if base_npv != 0 else 0
@@ -100,96 +218,62 @@ class SensitivityAnalyzer:
             'sensitivity_analysis': results
         }
     
+    def _run_variants_inplace(self, factor: str, take_snapshot, percentage_changes: List[float],
+                              skip_modules: Tuple[str, ...] = ()) -> List[Dict]:
+        """在当前进程中逐个计算各变化幅度，直接调整原模型，算完后按快照恢复被调整的字段"""
+        apply_change = getattr(self, f'_apply_{factor}_change')
+        snapshot = take_snapshot(self.model)
+        # 在基准结果的副本上计算，跳过的模块沿用副本中的基准结果
+        model_results = self.model.results
+        self.model.results = model_results.clone()
+        variants = []
+        try:
+            for change in percentage_changes:
+                apply_change(self.model, change)
+                variants.append(self._calculate_model(self.model, skip_modules))
+                _restore(snapshot)
+        finally:
+            _restore(snapshot)
+            self.model.results = model_results
+        return variants
+    
     def _apply_revenue_change(self, model: FinancialModel, percentage: float):
         """应用收入变化"""
+        if percentage == 0:
+            return
         multiplier = 1 + percentage / 100
-        for year in model.revenue.factory_building_revenue:
-            model.revenue.factory_building_revenue[year] = round_decimal(
-                float(model.revenue.factory_building_revenue[year] * multiplier)
-            )
-        
-        for year in model.revenue.supporting_facility_revenue:
-            model.revenue.supporting_facility_revenue[year] = round_decimal(
-                float(model.revenue.supporting_facility_revenue[year] * multiplier)
-            )
-        
-        for year in model.revenue.property_service_revenue:
-            model.revenue.property_service_revenue[year] = round_decimal(
-                float(model.revenue.property_service_revenue[year] * multiplier)
-            )
-        
-        for year in model.revenue.parking_revenue:
-            model.revenue.parking_revenue[year] = round_decimal(
-                float(model.revenue.parking_revenue[year] * multiplier)
-            )
-        
-        for year in model.revenue.advertising_revenue:
-            model.revenue.advertising_revenue[year] = round_decimal(
-                float(model.revenue.advertising_revenue[year] * multiplier)
-            )
+        revenue = model.revenue
+        for name in _REVENUE_FIELDS:
+            _scale_dict(getattr(revenue, name), multiplier)
     
     def _apply_cost_change(self, model: FinancialModel, percentage: float):
         """应用成本变化"""
+        if percentage == 0:
+            return
         multiplier = 1 + percentage / 100
-        for year in model.cost.material_cost:
-            model.cost.material_cost[year] = round_decimal(
-                float(model.cost.material_cost[year] * multiplier)
-            )
-        
-        for year in model.cost.fuel_power_cost:
-            model.cost.fuel_power_cost[year] = round_decimal(
-                float(model.cost.fuel_power_cost[year] * multiplier)
-            )
-        
-        for year in model.cost.labor_cost:
-            model.cost.labor_cost[year] = round_decimal(
-                float(model.cost.labor_cost[year] * multiplier)
-            )
-        
-        for year in model.cost.other_cost:
-            model.cost.other_cost[year] = round_decimal(
-                float(model.cost.other_cost[year] * multiplier)
-            )
+        cost = model.cost
+        for name in _COST_FIELDS:
+            _scale_dict(getattr(cost, name), multiplier)
     
     def _apply_investment_change(self, model: FinancialModel, percentage: float):
         """应用投资变化"""
+        if percentage == 0:
+            return
         multiplier = 1 + percentage / 100
-        model.investment.building_cost = round_decimal(
-            float(model.investment.building_cost * multiplier)
-        )
-        model.investment.equipment_procurement_cost = round_decimal(
-            float(model.investment.equipment_procurement_cost * multiplier)
-        )
-        model.investment.equipment_installation_cost = round_decimal(
-            float(model.investment.equipment_installation_cost * multiplier)
-        )
-        model.investment.public_equipment_procurement_cost = round_decimal(
-            float(model.investment.public_equipment_procurement_cost * multiplier)
-        )
-        model.investment.public_equipment_installation_cost = round_decimal(
-            float(model.investment.public_equipment_installation_cost * multiplier)
-        )
-        model.investment.construction_management_fee = round_decimal(
-            float(model.investment.construction_management_fee * multiplier)
-        )
-        model.investment.technical_consulting_fee = round_decimal(
-            float(model.investment.technical_consulting_fee * multiplier)
-        )
-        model.investment.infrastructure_fee = round_decimal(
-            float(model.investment.infrastructure_fee * multiplier)
-        )
-        model.investment.basic_contingency_reserve = round_decimal(
-            float(model.investment.basic_contingency_reserve * multiplier)
-        )
-        model.investment.price_contingency_reserve = round_decimal(
-            float(model.investment.price_contingency_reserve * multiplier)
-        )
+        investment = model.investment
+        values = np.array([float(getattr(investment, name)) for name in _INVESTMENT_FIELDS])
+        values *= multiplier
+        for name, value in zip(_INVESTMENT_FIELDS, values.tolist()):
+            setattr(investment, name, round_decimal(value))
     
     def _apply_discount_rate_change(self, model: FinancialModel, percentage: float):
         """应用折现率变化"""
+        if percentage == 0:
+            return
         multiplier = 1 + percentage / 100
-        model.parameters.discount_rate = round_decimal(
-            float(model.parameters.discount_rate * multiplier)
+        model.parameters = replace(
+            model.parameters,
+            discount_rate=round_decimal(float(model.parameters.discount_rate) * multiplier)
         )
     
     def multi_factor_analysis(self, 
@@ -279,4 +363,11 @@ class SensitivityAnalyzer:
                 '内部收益率变化(%)': item['irr_change'] * 100
             })
         
-        return pd.DataFrame(data)
\ No newline at end of file
+        return pd.DataFrame(data)
+
+
+def _run_variant(model_bytes: bytes, factor: str, skip_modules: Tuple[str, ...], change: float) -> Dict:
+    """子进程中计算单个变化幅度：反序列化模型，应用变化后计算"""
+    analyzer = SensitivityAnalyzer(pickle.loads(model_bytes), max_workers=1)
+    getattr(analyzer, f'_apply_{factor}_change')(analyzer.model, change)
+    return analyzer._calculate_model(analyzer.model, skip_modules)
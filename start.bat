@@ -7,7 +7,7 @@ echo.
 REM Check Python installation
 python --version >nul 2>&1
 if %errorlevel% neq 0 (
-    echo [ERROR] Python not detected, please install Python 3.8+
+    echo [ERROR] Python not detected, please install Python 3.10+
     echo Download: https://www.python.org/downloads/
     pause
     exit /b 1
@@ -106,7 +106,7 @@ if %errorlevel% neq 0 (
     echo Please check the following issues:
     echo 1. Ensure all dependencies are installed (pip install -r requirements.txt)
     echo 2. Ensure port 8501 is not in use
-    echo 3. Check Python version (3.8+ required)
+    echo 3. Check Python version (3.10+ required)
     echo 4. Check if there are any import errors in app.py
     echo.
     echo For help, run: python check_dependencies.py
@@ -10,7 +10,7 @@ echo ""
 
 # 检查Python是否安装
 if ! command -v python3 &> /dev/null; then
-    echo "[错误] 未检测到Python3，请先安装Python 3.8+"
+    echo "[错误] 未检测到Python3，请先安装Python 3.10+"
     echo "下载地址: https://www.python.org/downloads/"
     exit 1
 fi
@@ -86,7 +86,7 @@ if [ $? -ne 0 ]; then
     echo "请检查以下问题："
     echo "1. 确保已安装所有依赖包（pip install -r requirements.txt）"
     echo "2. 确保端口8501未被占用"
-    echo "3. 检查Python版本是否符合要求（3.8+）"
+    echo "3. 检查Python版本是否符合要求（3.10+）"
     echo ""
     exit 1
 fi
\ No newline at end of file
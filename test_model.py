@@ -5,25 +5,35 @@
 用于验证计算逻辑是否正确
 """
 
+import logging
+
+import numpy as np
+
+import financial_kernels
+from decimal import Decimal, ROUND_HALF_UP
+
 from financial_core import FinancialModel
-from investment_module import InvestmentModule
+from investment_module import InvestmentModule, ProjectInvestmentSummaryCalculator
 from cost_module import CostModule
-from revenue_module import RevenueModule
+from revenue_module import RevenueModule, RevenueTaxCalculator, ProfitCalculator
 from financial_comprehensive_module import FinancialComprehensiveModule
+from sensitivity_analyzer import SensitivityAnalyzer
 
+# 输出统一走logging，计时时可用logging.disable(logging.CRITICAL)关闭
+log = logging.getLogger('testmodel')
 
 def test_basic_calculation():
     """测试基本计算功能"""
-    print("=" * 60)
-    print("财务模型测试")
-    print("=" * 60)
+    log.info("=" * 60)
+    log.info("财务模型测试")
+    log.info("=" * 60)
     
     # 创建模型
     model = FinancialModel()
-    print(f"\n项目名称: {model.basic_info.project_name}")
-    print(f"建设期: {model.period.construction_period}年")
-    print(f"运营期: {model.period.operation_period}年")
-    print(f"计算期: {model.period.total_period}年")
+    log.info("\n项目名称: %s", model.basic_info.project_name)
+    log.info("建设期: %s年", model.period.construction_period)
+    log.info("运营期: %s年", model.period.operation_period)
+    log.info("计算期: %s年", model.period.total_period)
     
     # 设置测试数据
     # 收入数据（运营期第1年）
@@ -36,103 +46,99 @@ def test_basic_calculation():
     model.cost.labor_cost[4] = 800.0
     
     # 执行计算
-    print("\n正在执行计算...")
+    log.info("\n正在执行计算...")
     
     # 投资模块
     investment_module = InvestmentModule(model)
     if investment_module.calculate_all():
-        print("✓ 投资模块计算完成")
+        log.info("✓ 投资模块计算完成")
     else:
-        print("✗ 投资模块计算失败")
+        log.error("✗ 投资模块计算失败")
         return False
     
     # 成本模块
     cost_module = CostModule(model)
     if cost_module.calculate_all():
-        print("✓ 成本模块计算完成")
+        log.info("✓ 成本模块计算完成")
     else:
-        print("✗ 成本模块计算失败")
+        log.error("✗ 成本模块计算失败")
         return False
     
     # 收益模块
     revenue_module = RevenueModule(model)
     if revenue_module.calculate_all():
-        print("✓ 收益模块计算完成")
+        log.info("✓ 收益模块计算完成")
     else:
-        print("✗ 收益模块计算失败")
+        log.error("✗ 收益模块计算失败")
         return False
     
     # 财务综合模块
     financial_comprehensive_module = FinancialComprehensiveModule(model)
     if financial_comprehensive_module.calculate_all():
-        print("✓ 财务综合模块计算完成")
+        log.info("✓ 财务综合模块计算完成")
     else:
-        print("✗ 财务综合模块计算失败")
+        log.error("✗ 财务综合模块计算失败")
         return False
     
     # 显示关键结果
-    print("\n" + "=" * 60)
-    print("计算结果")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info("计算结果")
+    log.info("=" * 60)
     
     results = model.results
     
     # 投资汇总
-    print("\n投资汇总:")
+    log.info("\n投资汇总:")
     inv_summary = investment_module.get_investment_summary()
-    print(f"  工程费: {float(inv_summary['engineering_cost']):,.2f}万元")
-    print(f"  工程建设其他费: {float(inv_summary['other_construction_cost']):,.2f}万元")
-    print(f"  预备费: {float(inv_summary['contingency_reserve']):,.2f}万元")
-    print(f"  建设期利息: {float(inv_summary['construction_interest']):,.2f}万元")
-    print(f"  流动资金: {float(inv_summary['working_capital']):,.2f}万元")
-    print(f"  项目总投资: {float(inv_summary['total_investment']):,.2f}万元")
+    log.info("  工程费: %.2f万元", inv_summary['engineering_cost'])
+    log.info("  工程建设其他费: %.2f万元", inv_summary['other_construction_cost'])
+    log.info("  预备费: %.2f万元", inv_summary['contingency_reserve'])
+    log.info("  建设期利息: %.2f万元", inv_summary['construction_interest'])
+    log.info("  流动资金: %.2f万元", inv_summary['working_capital'])
+    log.info("  项目总投资: %.2f万元", inv_summary['total_investment'])
     
     # 财务指标
-    print("\n财务指标:")
+    log.info("\n财务指标:")
     indicators = financial_comprehensive_module.get_financial_indicators()
-    print(f"  净现值(NPV): {indicators['npv']:,.2f}万元")
-    print(f"  内部收益率(IRR): {indicators['irr']:.2%}")
+    log.info("  净现值(NPV): %.2f万元", indicators['npv'])
+    log.info("  内部收益率(IRR): %.2f%%", indicators['irr'] * 100)
     if indicators['static_payback_period'] > 0:
-        print(f"  静态投资回收期: {indicators['static_payback_period']:.2f}年")
+        log.info("  静态投资回收期: %.2f年", indicators['static_payback_period'])
     else:
-        print(f"  静态投资回收期: 未回收")
+        log.info("  静态投资回收期: 未回收")
     
     # 前5年现金流量
-    print("\n前5年现金流量:")
-    print("  年份  现金流入  现金流出  净现金流量  累计净现金流量")
+    log.info("\n前5年现金流量:")
+    log.info("  年份  现金流入  现金流出  净现金流量  累计净现金流量")
     for i in range(5):
         year = i + 1
-        print(f"  {year:2d}年  {float(results.annual_cash_flow_in[i]):10.2f}  "
-              f"{float(results.annual_cash_flow_out[i]):10.2f}  "
-              f"{float(results.annual_net_cash_flow[i]):10.2f}  "
-              f"{float(results.cumulative_cash_flow[i]):15.2f}")
+        log.info("  %2d年  %10.2f  %10.2f  %10.2f  %15.2f", year,
+                 results.annual_cash_flow_in[i], results.annual_cash_flow_out[i],
+                 results.annual_net_cash_flow[i], results.cumulative_cash_flow[i])
     
     # 前5年利润
-    print("\n前5年利润:")
-    print("  年份  营业收入  营业成本  折旧  摊销  税前利润  所得税  税后利润")
+    log.info("\n前5年利润:")
+    log.info("  年份  营业收入  营业成本  折旧  摊销  税前利润  所得税  税后利润")
     for i in range(5):
         year = i + 1
-        print(f"  {year:2d}年  "
-              f"{float(results.annual_revenue[i]):8.2f}  "
-              f"{float(results.annual_cost[i]):8.2f}  "
-              f"{float(results.annual_depreciation[i]):5.2f}  "
-              f"{float(results.annual_amortization[i]):5.2f}  "
-              f"{float(results.annual_profit_before_tax[i]):8.2f}  "
-              f"{float(results.annual_income_tax[i]):6.2f}  "
-              f"{float(results.annual_profit_after_tax[i]):8.2f}")
-    
-    print("\n" + "=" * 60)
-    print("测试完成！")
-    print("=" * 60)
+        log.info("  %2d年  %8.2f  %8.2f  %5.2f  %5.2f  %8.2f  %6.2f  %8.2f", year,
+                 results.annual_revenue[i], results.annual_cost[i],
+                 results.annual_depreciation[i], results.annual_amortization[i],
+                 results.annual_profit_before_tax[i], results.annual_income_tax[i],
+                 results.annual_profit_after_tax[i])
+    
+    log.info("\n" + "=" * 60)
+    log.info("测试完成！")
+    log.info("=" * 60)
     
     return True
 
 
 def test_year_adjustment():
     """测试年份数据迁移"""
-    print("\n" + "=" * 60)
-    print("年份数据迁移测试")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info("年份数据迁移测试")
+    log.info("=" * 60)
     
     # 创建模型
     model = FinancialModel()
@@ -141,49 +147,227 @@ def test_year_adjustment():
     for year in range(4, 21):
         model.revenue.factory_building_revenue[year] = year * 1000.0
     
-    print(f"\n原始设置: 建设期{model.period.construction_period}年，运营期{model.period.operation_period}年")
-    print(f"收入数据数量: {len(model.revenue.factory_building_revenue)}")
+    log.info("\n原始设置: 建设期%s年，运营期%s年", model.period.construction_period, model.period.operation_period)
+    log.info("收入数据数量: %s", len(model.revenue.factory_building_revenue))
     
     # 修改期间
-    print("\n修改期间: 建设期改为5年，运营期改为15年")
+    log.info("\n修改期间: 建设期改为5年，运营期改为15年")
     model.update_period(5, 15)
     
-    print(f"新设置: 建设期{model.period.construction_period}年，运营期{model.period.operation_period}年")
-    print(f"收入数据数量: {len(model.revenue.factory_building_revenue)}")
+    log.info("新设置: 建设期%s年，运营期%s年", model.period.construction_period, model.period.operation_period)
+    log.info("收入数据数量: %s", len(model.revenue.factory_building_revenue))
     
     # 检查数据迁移
-    print("\n检查数据迁移:")
+    log.info("\n检查数据迁移:")
     for year in [6, 10, 15, 16, 20]:
         if year in model.revenue.factory_building_revenue:
-            print(f"  第{year}年收入: {float(model.revenue.factory_building_revenue[year]):.2f}万元 ✓")
+            log.info("  第%s年收入: %.2f万元 ✓", year, model.revenue.factory_building_revenue[year])
         else:
-            print(f"  第{year}年收入: 不存在（已删除）✓")
+            log.info("  第%s年收入: 不存在（已删除）✓", year)
+    
+    log.info("\n年份数据迁移测试完成！")
+    
+    return True
+
+
+def test_year_shrink_migration():
+    """测试缩短计算期时删除超出年份的数据"""
+    log.info("\n" + "=" * 60)
+    log.info("缩短计算期数据迁移测试")
+    log.info("=" * 60)
+    
+    model = FinancialModel()
+    for year in range(4, 21):
+        model.revenue.factory_building_revenue[year] = year * 1000.0
+        model.revenue.parking_revenue[year] = 100.0
+        model.cost.other_cost[year] = 50.0
+        model.tax.subsidy_income[year] = 10.0
+    
+    log.info("\n修改期间: 建设期改为3年，运营期改为7年")
+    model.update_period(3, 7)
+    
+    for data in (model.revenue.factory_building_revenue, model.revenue.parking_revenue,
+                 model.cost.other_cost, model.tax.subsidy_income):
+        assert max(data) == 10
+        assert len(data) == 7
+    log.info("  第11-20年数据已删除 ✓")
+    
+    log.info("\n缩短计算期数据迁移测试完成！")
+    
+    return True
+
+
+def test_investment_summary_rounding():
+    """测试投资汇总按Decimal精确求和后四舍五入（float求和会把半分值舍掉）"""
+    model = FinancialModel()
+    model.investment.building_cost = Decimal('12345.675')
+    model.investment.equipment_procurement_cost = Decimal('2360.38')
+    model.investment.equipment_installation_cost = Decimal('18299.19')
+    
+    summary = ProjectInvestmentSummaryCalculator(model).summarize()
+    assert summary['engineering_cost'] == Decimal('33005.25')
+    log.info("  工程费: %s万元 ✓", summary['engineering_cost'])
+    
+    return True
+
+
+def test_compute_flows_payback():
+    """测试简化模型现金流内核的NPV和静态投资回收期（JIT编译后结果须与逐年计算一致）"""
+    log.info("\n" + "=" * 60)
+    log.info("现金流内核测试")
+    log.info("=" * 60)
+    
+    # 建设期2年投入1000，运营期每年税前利润300、税后净现金流225
+    income = np.array([0.0, 0.0] + [400.0] * 8)
+    cost = np.array([0.0, 0.0] + [100.0] * 8)
+    cash_flow, cumulative, npv, payback = financial_kernels.compute_flows(income, cost, 1000.0, 2, 0.06)
+    
+    expected = np.array([-500.0, -500.0] + [225.0] * 8)
+    assert np.allclose(cash_flow, expected)
+    assert np.allclose(cumulative, np.cumsum(expected))
+    assert abs(npv - (expected / 1.06 ** np.arange(10)).sum()) < 1e-9
+    # 第7年（下标6）累计净现金流量转正：6 + 100/225
+    assert abs(payback - (6 + 100 / 225)) < 1e-12
+    log.info("  投资回收期: %.4f年 ✓", payback)
+    
+    # 未回收时返回nan
+    _, _, _, payback = financial_kernels.compute_flows(income, cost, 100000.0, 2, 0.06)
+    assert np.isnan(payback)
+    log.info("  未回收: nan ✓")
+    
+    return True
+
+
+def test_financial_kernels():
+    """测试亏损弥补、IRR和投资回收期内核"""
+    log.info("\n" + "=" * 60)
+    log.info("财务指标内核测试")
+    log.info("=" * 60)
+    
+    # 亏损按发生先后弥补：100、50两笔亏损，第4年盈利80弥补后剩20未弥补，第5年盈利100弥补70后应纳税30
+    profit = np.array([0, -100, -50, 80, 100, 200], dtype=np.int64)
+    mask = np.array([False, True, True, True, True, True])
+    assert financial_kernels.taxable_profit(profit, mask, 5).tolist() == [0, 0, 0, 0, 30, 200]
+    # 弥补年限1年时只保留最近一笔亏损；0年时不弥补
+    profit = np.array([-100, -50, 200], dtype=np.int64)
+    mask = np.ones(3, dtype=bool)
+    assert financial_kernels.taxable_profit(profit, mask, 1).tolist() == [0, 0, 150]
+    assert financial_kernels.taxable_profit(profit, mask, 0).tolist() == [0, 0, 200]
+    log.info("  亏损弥补 ✓")
+    
+    assert abs(financial_kernels.irr(np.array([-100.0, 110.0])) - 0.1) < 1e-9
+    assert abs(financial_kernels.irr(np.array([-100.0, 0.0, 121.0])) - 0.1) < 1e-9
+    assert np.isnan(financial_kernels.irr(np.array([100.0, 50.0])))
+    log.info("  内部收益率 ✓")
+    
+    cash_flows = np.array([-100.0, 50.0, 60.0])
+    payback = financial_kernels.payback(cash_flows, np.cumsum(cash_flows))
+    assert abs(payback - (2 + 50 / 60)) < 1e-12
+    assert np.isnan(financial_kernels.payback(-cash_flows, np.cumsum(-cash_flows)))
+    log.info("  投资回收期 ✓")
+    
+    return True
+
+
+def test_revenue_profit_fixed_point():
+    """测试收益模块的定点整数计算与Decimal逐项计算一致"""
+    log.info("\n" + "=" * 60)
+    log.info("收入与利润定点计算测试")
+    log.info("=" * 60)
+    
+    model = FinancialModel()
+    model.update_period(1, 4)
+    revenue = model.revenue
+    for year in range(2, 6):
+        revenue.factory_building_revenue[year] = Decimal('1000.005') * year
+        revenue.property_service_revenue[year] = Decimal('333.333')
+        revenue.parking_revenue[year] = Decimal('12.345')
+    
+    assert RevenueTaxCalculator(model).calculate()
+    results = model.results
+    assert results.annual_revenue[0] == 0 and results.annual_vat_output[0] == 0
+    for year in range(2, 6):
+        revenue_9 = revenue.factory_building_revenue[year] + revenue.parking_revenue[year]
+        revenue_6 = revenue.property_service_revenue[year]
+        expected_vat = (
+            revenue_9 * Decimal('0.09') / Decimal('1.09') + revenue_6 * Decimal('0.06') / Decimal('1.06')
+        ).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        assert results.annual_revenue[year - 1] == (revenue_9 + revenue_6).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        assert results.annual_vat_output[year - 1] == expected_vat
+    log.info("  营业收入、销项税 ✓")
+    
+    # 税前利润依次为-100、-50、80、100：第5年弥补剩余亏损70后按30计税
+    model.initialize_results()
+    for year_idx, amount in enumerate(('-100', '-50', '80', '100'), start=1):
+        results.annual_revenue[year_idx] = Decimal(amount)
+    assert ProfitCalculator(model).calculate()
+    assert results.annual_income_tax == [Decimal('0')] * 4 + [Decimal('7.50')]
+    assert results.annual_profit_after_tax[1:] == [Decimal('-100'), Decimal('-50'), Decimal('80'), Decimal('92.50')]
+    log.info("  亏损弥补后所得税 ✓")
+    
+    return True
+
+
+def test_sensitivity_restores_model():
+    """测试敏感性分析在原模型上调整后恢复原值"""
+    log.info("\n" + "=" * 60)
+    log.info("敏感性分析模型恢复测试")
+    log.info("=" * 60)
+    
+    model = FinancialModel()
+    for year in range(4, 21):
+        model.revenue.factory_building_revenue[year] = Decimal('9840.00')
+        model.revenue.parking_revenue[year] = Decimal('120.07')
+        model.cost.material_cost[year] = Decimal('1000.00')
+        model.cost.labor_cost[year] = Decimal('800.00')
+    
+    analyzer = SensitivityAnalyzer(model)
+    base = analyzer.calculate_base_case()
+    model_data = model.to_dict()
+    net_cash_flow = list(model.results.annual_net_cash_flow)
+    
+    for factor in ('revenue', 'cost', 'investment', 'discount_rate'):
+        result = analyzer.single_factor_analysis(factor, [-10, 0, 10])
+        changes = result['sensitivity_analysis']
+        assert changes[1]['npv'] == base['npv']
+        assert model.to_dict() == model_data
+        assert model.results.annual_net_cash_flow == net_cash_flow
     
-    print("\n年份数据迁移测试完成！")
+    # 收入增加时NPV增加
+    changes = analyzer.single_factor_analysis('revenue', [-10, 10])['sensitivity_analysis']
+    assert changes[0]['npv'] < base['npv'] < changes[1]['npv']
+    log.info("  调整后模型已恢复 ✓")
     
     return True
 
 
 def main():
     """主函数"""
-    print("\n")
-    print("*" * 60)
-    print("*" + " " * 58 + "*")
-    print("*" + "  建设项目经济评价系统 - 测试脚本".center(58) + "*")
-    print("*" + " " * 58 + "*")
-    print("*" * 60)
-    print("\n")
+    log.info("\n")
+    log.info("*" * 60)
+    log.info("*" + " " * 58 + "*")
+    log.info("*" + "  建设项目经济评价系统 - 测试脚本".center(58) + "*")
+    log.info("*" + " " * 58 + "*")
+    log.info("*" * 60)
+    log.info("\n")
     
     # 运行测试
     test_basic_calculation()
     test_year_adjustment()
+    test_year_shrink_migration()
+    test_investment_summary_rounding()
+    test_compute_flows_payback()
+    test_financial_kernels()
+    test_revenue_profit_fixed_point()
+    test_sensitivity_restores_model()
     
-    print("\n")
-    print("*" * 60)
-    print("所有测试完成！")
-    print("*" * 60)
-    print("\n")
+    log.info("\n")
+    log.info("*" * 60)
+    log.info("所有测试完成！")
+    log.info("*" * 60)
+    log.info("\n")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
\ No newline at end of file